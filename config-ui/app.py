@@ -1,13 +1,36 @@
 #!/usr/bin/env python3
 import os
+import re
+import sys
+import hmac
+import types
+import pstats
+import cProfile
+import base64
+import socket
+import hashlib
+import http.client
+import zlib
 import json
 import subprocess
 import threading
 import time
 import queue
 import signal
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from concurrent.futures import ThreadPoolExecutor
+from array import array
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, Response
+import websocket
+from flask import Flask, render_template, request, jsonify, Response, send_from_directory
+
+# zstd exports are optional; gzip (stdlib) is always available
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 app = Flask(__name__)
 
@@ -17,6 +40,12 @@ ENV_FILE = CONFIG_DIR / ".env"
 RELAYS_BLASTR_FILE = CONFIG_DIR / "relays_blastr.json"
 RELAYS_IMPORT_FILE = CONFIG_DIR / "relays_import.json"
 
+# SHA-256 of the last .env whose npubs were validated here at save time. The
+# relay entrypoint skips its (slow, pure-shell) checksum verification when the
+# .env still matches, and validates in full when the file was hand-edited.
+# Keep the format (hex digest + newline) in sync with haven-relay/entrypoint.sh.
+ENV_VALIDATED_STAMP = CONFIG_DIR / ".env.validated"
+
 # The relay entrypoint refuses to start Haven until every required npub is a
 # real key (see haven-relay/entrypoint.sh); mirror that check so the UI can
 # report "awaiting configuration" instead of "stopped" on fresh installs.
@@ -79,10 +108,34 @@ def parse_env_text(text):
     return env
 
 
-def is_relay_configured():
+def env_digest(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def write_validated_stamp():
+    """Stamp the current .env as validated (call only after validating it)."""
+    try:
+        ENV_VALIDATED_STAMP.write_text(env_digest(ENV_FILE.read_bytes()) + '\n')
+    except OSError as e:
+        print(f"Failed to write validated-config stamp: {e}", flush=True)
+
+
+def is_env_stamped(content, config_dir=CONFIG_DIR):
+    """True when `content` (bytes) is exactly the .env last validated on save."""
+    try:
+        stamp = (config_dir / ENV_VALIDATED_STAMP.name).read_text()
+        return stamp.strip() == env_digest(content)
+    except OSError:
+        return False
+
+
+def is_relay_configured(config_dir=CONFIG_DIR):
     """True when the .env contains a checksum-valid npub for every required key."""
     try:
-        env = parse_env_text(ENV_FILE.read_text())
+        content = (config_dir / ENV_FILE.name).read_bytes()
+        if is_env_stamped(content, config_dir):
+            return True
+        env = parse_env_text(content.decode())
         return all(is_valid_npub(env.get(key, '')) for key in REQUIRED_NPUB_KEYS)
     except Exception:
         return False
@@ -123,6 +176,160 @@ def get_relay_container_name():
 RELAY_CONTAINER_NAME = get_relay_container_name()
 print(f"Relay container name: {RELAY_CONTAINER_NAME}", flush=True)
 
+# Where the relay listens for WebSocket clients; the config UI shares the
+# relay's network, so the container name resolves to it.
+RELAY_HOST = os.getenv('RELAY_HOST', '').strip() or RELAY_CONTAINER_NAME
+RELAY_PORT = int(os.getenv('RELAY_PORT', '3355'))
+
+
+def get_app_data_dir():
+    """Host path of the relay's data dir (mounted into the import helper)"""
+    app_data_dir = os.getenv('APP_DATA_DIR', './data')
+    if not os.path.isabs(app_data_dir):
+        app_data_dir = os.path.abspath(os.path.join(os.getcwd(), app_data_dir))
+    return app_data_dir
+
+
+# Relay instances managed by this UI. The relay configured above is always the
+# "default" instance; more can be registered in instances.json. Each needs its
+# config dir mounted into this container (under /haven-instances/<name> unless
+# given) and its data dir as a host path, which the import helper mounts.
+INSTANCES_FILE = CONFIG_DIR / "instances.json"
+INSTANCES_CONFIG_ROOT = Path("/haven-instances")
+DEFAULT_INSTANCE_NAME = 'default'
+
+# Most instances operated on at once by bulk operations (rolling restart)
+INSTANCE_CONCURRENCY_LIMIT = 4
+
+
+class RelayInstance:
+    """One Haven relay: where it runs and the restart/import running against it."""
+
+    def __init__(self, name, container_name, config_dir, data_dir, host=None, port=3355):
+        self.name = name
+        self.container_name = container_name
+        self.config_dir = Path(config_dir)
+        self.data_dir = data_dir
+        self.host = host or container_name
+        self.port = int(port)
+        self.env_file = self.config_dir / ENV_FILE.name
+        # The import helper gets a fixed name so its resource usage can be
+        # followed (and a leftover helper from a crashed run can be removed)
+        # while it runs.
+        self.import_container_name = f"{container_name}_import"
+
+        # Held while claiming the instance for a restart or an import, so the
+        # two never start together
+        self.operation_lock = threading.Lock()
+
+        # Restart state
+        self.restart_status = {'status': 'idle', 'message': '', 'phase': None}
+        self.restart_log_queue = queue.Queue()
+        self.restart_thread = None
+
+        # Import state
+        self.import_status = {'status': 'idle', 'message': ''}
+        self.import_log_queue = queue.Queue()
+        self.import_state_lock = threading.Lock()
+        self.import_control = {
+            'thread': None,
+            'process': None,
+            'cancel_event': None,
+        }
+        self._import_stats = None
+
+        # Pre-created import helper: spec of its arguments, or None if absent
+        self.warm_helper = {'spec': None, 'limits': {}}
+        self.warm_helper_lock = threading.Lock()
+
+    def import_stats(self):
+        """Collector for the import helper; only runs while an import does."""
+        if self._import_stats is None:
+            self._import_stats = StatsCollector(self.import_container_name)
+        return self._import_stats
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'container': self.container_name,
+            'config_dir': str(self.config_dir),
+            'data_dir': self.data_dir,
+            'host': self.host,
+            'port': self.port,
+        }
+
+
+DEFAULT_INSTANCE = RelayInstance(
+    DEFAULT_INSTANCE_NAME, RELAY_CONTAINER_NAME, CONFIG_DIR, get_app_data_dir(), RELAY_HOST, RELAY_PORT
+)
+instances_lock = threading.Lock()
+relay_instances = {DEFAULT_INSTANCE_NAME: DEFAULT_INSTANCE}
+
+
+def instance_from_dict(entry):
+    """Build a registered instance from its instances.json entry (raises on bad input)."""
+    if not isinstance(entry, dict):
+        raise ValueError('A relay instance must be an object')
+    for field in ('config_dir', 'data_dir', 'host'):
+        if not isinstance(entry.get(field) or '', str):
+            raise ValueError(f'{field} must be a string')
+    name = str(entry.get('name', '')).strip()
+    container = str(entry.get('container', '')).strip()
+    if not re.fullmatch(r'[A-Za-z0-9][A-Za-z0-9_.-]*', name) or name == DEFAULT_INSTANCE_NAME:
+        raise ValueError(f'Invalid instance name: {name!r}')
+    if not container:
+        raise ValueError(f'Instance {name} needs a container name')
+    # The UI writes its own state files into the config dir, so keep it to
+    # the directories mounted for relay instances
+    config_dir = Path(entry.get('config_dir') or INSTANCES_CONFIG_ROOT / name).resolve()
+    root = INSTANCES_CONFIG_ROOT.resolve()
+    if config_dir == root or not config_dir.is_relative_to(root):
+        raise ValueError(f'The config directory of instance {name} must be under {INSTANCES_CONFIG_ROOT}')
+    return RelayInstance(
+        name,
+        container,
+        config_dir,
+        entry.get('data_dir') or '',
+        entry.get('host'),
+        entry.get('port') or 3355,
+    )
+
+
+def load_instances():
+    """Register the instances listed in instances.json alongside the default."""
+    try:
+        entries = json.loads(INSTANCES_FILE.read_text())
+    except (OSError, ValueError):
+        return
+    if not isinstance(entries, list):
+        print(f"Ignoring {INSTANCES_FILE}: expected a list of relay instances", flush=True)
+        return
+    with instances_lock:
+        for entry in entries:
+            try:
+                instance = instance_from_dict(entry)
+            except (ValueError, TypeError) as e:
+                print(f"Skipping relay instance: {e}", flush=True)
+                continue
+            relay_instances.setdefault(instance.name, instance)
+
+
+def save_instances():
+    entries = [
+        instance.to_dict() for name, instance in relay_instances.items()
+        if name != DEFAULT_INSTANCE_NAME
+    ]
+    INSTANCES_FILE.write_text(json.dumps(entries, indent=2))
+
+
+def lookup_instance(name):
+    """Return (instance, None), or (None, error response) for an unknown name."""
+    instance = relay_instances.get(name or DEFAULT_INSTANCE_NAME)
+    if instance is None:
+        return None, (jsonify({'success': False, 'error': f'Unknown relay instance: {name}'}), 404)
+    return instance, None
+
+
 # Default configurations
 DEFAULT_ENV = """# Owner Configuration (REQUIRED)
 # Your Nostr public key (npub format)
@@ -211,6 +418,7 @@ def save_env_config():
                              'a single wrong character fails the npub checksum.'
                 }), 400
         ENV_FILE.write_text(content)
+        write_validated_stamp()
         return jsonify({'success': True, 'message': 'Environment configuration saved successfully'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -263,97 +471,1219 @@ def save_relay_config(relay_type):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/api/restart', methods=['POST'])
-def restart_haven():
-    """Restart the haven relay container"""
+# How long to wait for the relay to accept WebSocket connections after start.
+# Badger replays its value log on startup, which can take a while on big DBs.
+RESTART_READY_TIMEOUT = 180
+RESTART_READY_POLL_INTERVAL = 0.25
+
+RESTART_HISTORY_FILE = CONFIG_DIR / "restart_history.json"
+RESTART_HISTORY_LIMIT = 50
+
+
+def describe_runtime_error(error):
+    """Explain the usual cause when the relay container isn't visible to the engine."""
+    if 'no container' in error.lower() or 'no such container' in error.lower():
+        error += (
+            f" — the config UI is talking to the {CONTAINER_RUNTIME} socket, but the relay "
+            "container was not found there. If you launched the stack with a different "
+            "container engine, update DOCKER_SOCK and CONTAINER_RUNTIME in the root .env "
+            "and bring the stack up with that engine's compose command."
+        )
+    return error
+
+
+def relay_accepts_websocket(instance=DEFAULT_INSTANCE, timeout=2):
+    """True once the relay completes a WebSocket upgrade handshake.
+
+    The container's "running" state and even its HTTP healthcheck flip long
+    before clients can actually connect, so this performs the same upgrade a
+    Nostr client does and only succeeds on a "101 Switching Protocols".
+    """
+    key = base64.b64encode(os.urandom(16)).decode()
+    handshake = (
+        f"GET / HTTP/1.1\r\n"
+        f"Host: {instance.host}:{instance.port}\r\n"
+        "Upgrade: websocket\r\n"
+        "Connection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\n"
+        "Sec-WebSocket-Version: 13\r\n\r\n"
+    )
     try:
-        # Use detected container runtime
-        result = subprocess.run(
-            [CONTAINER_RUNTIME, 'restart', RELAY_CONTAINER_NAME],
+        with socket.create_connection((instance.host, instance.port), timeout=timeout) as sock:
+            sock.sendall(handshake.encode())
+            response = sock.recv(1024)
+        return response.split(b'\r\n', 1)[0].split(b' ')[1:2] == [b'101']
+    except (OSError, IndexError):
+        return False
+
+
+def load_restart_history(instance=DEFAULT_INSTANCE):
+    try:
+        return json.loads((instance.config_dir / RESTART_HISTORY_FILE.name).read_text())
+    except (OSError, ValueError):
+        return []
+
+
+def record_restart(entry, instance=DEFAULT_INSTANCE):
+    """Append a restart to the persisted history, keeping the newest entries."""
+    history = load_restart_history(instance)
+    history.append(entry)
+    try:
+        (instance.config_dir / RESTART_HISTORY_FILE.name).write_text(
+            json.dumps(history[-RESTART_HISTORY_LIMIT:], indent=2)
+        )
+    except OSError as e:
+        print(f"Failed to record restart: {e}", flush=True)
+
+
+def run_restart_process(instance, reason):
+    """Background thread: stop the relay, start it and wait until it's reachable.
+
+    Each phase is timed; the downtime recorded is from the moment the stop is
+    issued until the relay accepts WebSocket connections again.
+    """
+    phases = {}
+    started_at = time.time()
+    entry = {'started_at': started_at, 'reason': reason, 'success': False, 'phases': phases}
+    final_status = {'status': 'failed', 'message': 'Restart did not complete', 'phase': None}
+    # The relay reads its config files at startup, so whatever is on disk
+    # now is what this restart applies
+    fingerprint = config_fingerprint(instance)
+
+    def phase(name, message):
+        instance.restart_status.update({'phase': name, 'message': message})
+        instance.restart_log_queue.put({'type': 'phase', 'phase': name, 'message': message})
+
+    try:
+        phase('stop', 'Stopping HAVEN relay...')
+        phase_start = time.monotonic()
+        stop_result = subprocess.run(
+            [CONTAINER_RUNTIME, 'stop', instance.container_name],
             capture_output=True,
             text=True,
             timeout=30
         )
+        phases['stop'] = round(time.monotonic() - phase_start, 3)
+        if stop_result.returncode != 0:
+            raise Exception(describe_runtime_error(stop_result.stderr.strip()))
 
-        if result.returncode == 0:
-            return jsonify({'success': True, 'message': 'Haven relay restarted successfully'})
-        else:
-            error = result.stderr.strip()
-            if 'no container' in error.lower() or 'no such container' in error.lower():
-                error += (
-                    f" — the config UI is talking to the {CONTAINER_RUNTIME} socket, but the relay "
-                    "container was not found there. If you launched the stack with a different "
-                    "container engine, update DOCKER_SOCK and CONTAINER_RUNTIME in the root .env "
-                    "and bring the stack up with that engine's compose command."
+        phase('start', 'Starting HAVEN relay...')
+        phase_start = time.monotonic()
+        start_result = subprocess.run(
+            [CONTAINER_RUNTIME, 'start', instance.container_name],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        phases['start'] = round(time.monotonic() - phase_start, 3)
+        if start_result.returncode != 0:
+            raise Exception(describe_runtime_error(start_result.stderr.strip()))
+
+        phase('ready', 'Waiting for HAVEN relay to accept connections...')
+        phase_start = time.monotonic()
+        deadline = phase_start + RESTART_READY_TIMEOUT
+        while not relay_accepts_websocket(instance):
+            if time.monotonic() >= deadline:
+                raise Exception(
+                    f'Relay did not accept WebSocket connections within {RESTART_READY_TIMEOUT}s'
                 )
-            return jsonify({'success': False, 'error': error}), 500
-    except subprocess.TimeoutExpired:
-        return jsonify({'success': False, 'error': 'Restart command timed out'}), 500
+            time.sleep(RESTART_READY_POLL_INTERVAL)
+        phases['ready'] = round(time.monotonic() - phase_start, 3)
+
+        mark_config_applied(fingerprint, instance)
+        entry['success'] = True
+        entry['downtime'] = round(sum(phases.values()), 3)
+        message = f"HAVEN relay restarted (offline for {entry['downtime']:.1f}s)"
+        instance.restart_log_queue.put({'type': 'success', 'message': message, 'downtime': entry['downtime'], 'phases': phases})
+        final_status = {'status': 'completed', 'message': message, 'phase': None}
+
+    except Exception as e:
+        entry['error'] = str(e)
+        entry['downtime'] = round(time.time() - started_at, 3)
+        instance.restart_log_queue.put({'type': 'error', 'message': f'Restart failed: {e}'})
+        final_status = {'status': 'failed', 'message': str(e), 'phase': None}
+
+    finally:
+        # Persist before publishing the outcome so a client reacting to the
+        # final status already sees this restart in the history
+        record_restart(entry, instance)
+        instance.restart_status = final_status
+        resume_config_apply(instance)
+
+
+def start_restart(instance=DEFAULT_INSTANCE, reason='manual'):
+    """Start a tracked restart in the background; returns an error string or None."""
+    with instance.operation_lock:
+        if instance.restart_status['status'] == 'running':
+            return 'A restart is already in progress'
+        if instance.import_status['status'] == 'running':
+            return 'An import is running; the relay will be restarted when it finishes'
+
+        # Drop progress left over from the previous restart
+        while not instance.restart_log_queue.empty():
+            try:
+                instance.restart_log_queue.get_nowait()
+            except queue.Empty:
+                break
+
+        instance.restart_status = {'status': 'running', 'message': 'Restart requested', 'phase': None}
+        instance.restart_thread = threading.Thread(
+            target=run_restart_process, args=(instance, reason), daemon=True
+        )
+        instance.restart_thread.start()
+    return None
+
+
+@app.route('/api/restart', methods=['POST'])
+@app.route('/api/instances/<instance_name>/restart', methods=['POST'])
+def restart_haven(instance_name=None):
+    """Restart the haven relay container and track it until it accepts connections"""
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
+    try:
+        error = start_restart(instance)
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        return jsonify({'success': True, 'message': 'Restart started'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/api/status', methods=['GET'])
-def get_status():
-    """Get haven relay status"""
+@app.route('/api/restart/stream')
+@app.route('/api/instances/<instance_name>/restart/stream')
+def restart_stream(instance_name=None):
+    """Stream restart progress using Server-Sent Events"""
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
+
+    def generate():
+        status = instance.restart_status
+        yield f"data: {json.dumps({'type': 'status', 'status': status['status'], 'phase': status['phase']})}\n\n"
+
+        while True:
+            try:
+                event = instance.restart_log_queue.get(timeout=1)
+                yield f"data: {json.dumps(event)}\n\n"
+
+                status = instance.restart_status
+                if status['status'] in ['completed', 'failed'] and instance.restart_log_queue.empty():
+                    yield f"data: {json.dumps({'type': 'status', 'status': status['status']})}\n\n"
+                    break
+
+            except queue.Empty:
+                status = instance.restart_status
+                if status['status'] != 'running':
+                    yield f"data: {json.dumps({'type': 'status', 'status': status['status']})}\n\n"
+                    break
+                yield f": heartbeat\n\n"
+
+    return Response(generate(), mimetype='text/event-stream')
+
+
+@app.route('/api/restart/history', methods=['GET'])
+@app.route('/api/instances/<instance_name>/restart/history', methods=['GET'])
+def get_restart_history(instance_name=None):
+    """Get recent restarts with their downtime broken down by phase"""
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
     try:
-        inspect_cmd = [
-            CONTAINER_RUNTIME,
-            'inspect',
-            '-f',
-            '{{json .State}}',
-            RELAY_CONTAINER_NAME
-        ]
-        result = subprocess.run(
-            inspect_cmd,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        history = load_restart_history(instance)
+        return jsonify({
+            'success': True,
+            'status': instance.restart_status['status'],
+            'phase': instance.restart_status['phase'],
+            'restarts': list(reversed(history)),
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-        if result.returncode == 0:
-            state_info = json.loads(result.stdout.strip())
-            status = state_info.get('Status', 'unknown')
-            health = state_info.get('Health', {})
-            health_status = health.get('Status', 'unknown') if health else 'unknown'
 
-            running = status == 'running' and health_status == 'healthy'
+# Files the relay only reads at startup: a change to any of them takes a
+# restart to apply, and nothing else does. The import seed list is left out:
+# only `--import` reads it, and an import stops and starts the relay anyway.
+APPLIED_CONFIG_FILES = (ENV_FILE, RELAYS_BLASTR_FILE)
+APPLIED_CONFIG_STAMP = CONFIG_DIR / ".applied_config.json"
+
+# Saves within this many seconds of each other are applied by one restart
+APPLY_DEBOUNCE_SECONDS = 5
+
+
+def config_fingerprint(instance=DEFAULT_INSTANCE):
+    """Map each config file the relay reads at startup to a hash of its contents."""
+    fingerprint = {}
+    for name in (path.name for path in APPLIED_CONFIG_FILES):
+        try:
+            fingerprint[name] = hashlib.sha256((instance.config_dir / name).read_bytes()).hexdigest()
+        except OSError:
+            fingerprint[name] = None
+    return fingerprint
+
+
+def load_applied_fingerprint(instance=DEFAULT_INSTANCE):
+    try:
+        return json.loads((instance.config_dir / APPLIED_CONFIG_STAMP.name).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def mark_config_applied(fingerprint, instance=DEFAULT_INSTANCE):
+    """Record the config the relay was (re)started with."""
+    try:
+        (instance.config_dir / APPLIED_CONFIG_STAMP.name).write_text(json.dumps(fingerprint, indent=2))
+    except OSError as e:
+        print(f"Failed to record applied config: {e}", flush=True)
+
+
+def changed_config_files():
+    """Names of the config files that differ from what the relay was started with."""
+    applied = load_applied_fingerprint() or {}
+    current = config_fingerprint()
+    return [name for name, digest in current.items() if applied.get(name) != digest]
+
+
+# Config apply state management
+apply_state_lock = threading.Lock()
+apply_control = {
+    'timer': None,
+    'apply_at': None,
+    # Set while an apply waits for a running restart or import to finish
+    'waiting': False,
+}
+
+
+def schedule_config_apply():
+    """(Re)arm the debounced apply; returns the changed files and the delay.
+
+    Every call pushes the restart back by APPLY_DEBOUNCE_SECONDS, so a burst
+    of saves costs a single restart. Nothing is scheduled when the config on
+    disk is what the relay is already running with.
+    """
+    changed = changed_config_files()
+    with apply_state_lock:
+        if apply_control['timer']:
+            apply_control['timer'].cancel()
+        apply_control['timer'] = None
+        apply_control['apply_at'] = None
+        apply_control['waiting'] = False
+        if not changed:
+            return changed, None
+
+        timer = threading.Timer(APPLY_DEBOUNCE_SECONDS, run_config_apply)
+        timer.daemon = True
+        apply_control['timer'] = timer
+        apply_control['apply_at'] = time.time() + APPLY_DEBOUNCE_SECONDS
+        timer.start()
+    return changed, APPLY_DEBOUNCE_SECONDS
+
+
+def run_config_apply():
+    """Debounce timer callback: restart the relay if the config still differs."""
+    with apply_state_lock:
+        apply_control['timer'] = None
+        apply_control['apply_at'] = None
+
+    # The saves may have been reverted while we waited
+    changed = changed_config_files()
+    if not changed:
+        print("Config apply: no changes left to apply, skipping restart", flush=True)
+        return
+
+    # Wait before trying, so a restart or import finishing meanwhile
+    # already sees this apply in resume_config_apply
+    with apply_state_lock:
+        apply_control['waiting'] = True
+    error = start_restart(DEFAULT_INSTANCE, f"config changed: {', '.join(changed)}")
+    if error:
+        print(f"Config apply waiting: {error}", flush=True)
+        return
+    with apply_state_lock:
+        apply_control['waiting'] = False
+
+
+def resume_config_apply(instance):
+    """Check a pending apply again once a restart or import has finished.
+
+    Both mark the config they started the relay with, so this only restarts
+    for changes saved meanwhile - or when the relay didn't come back up.
+    """
+    if instance is not DEFAULT_INSTANCE:
+        return
+    with apply_state_lock:
+        pending = apply_control['waiting'] or apply_control['timer'] is not None
+    if pending:
+        schedule_config_apply()
+
+
+@app.route('/api/config/apply', methods=['GET'])
+def get_config_apply():
+    """Report whether saved config differs from what the relay is running with"""
+    try:
+        apply_at = apply_control['apply_at']
+        return jsonify({
+            'success': True,
+            'changed': changed_config_files(),
+            'pending': apply_at is not None or apply_control['waiting'],
+            'apply_in': max(apply_at - time.time(), 0) if apply_at else None,
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/config/apply', methods=['POST'])
+def apply_config():
+    """Apply saved config with a debounced restart, skipping it if nothing changed"""
+    try:
+        changed, delay = schedule_config_apply()
+        if not changed:
             return jsonify({
                 'success': True,
-                'status': status,
-                'health': health_status,
-                'running': running,
-                'configured': is_relay_configured()
+                'restart': False,
+                'changed': [],
+                'message': 'Configuration unchanged, no restart needed'
             })
+        return jsonify({
+            'success': True,
+            'restart': True,
+            'changed': changed,
+            'delay': delay,
+            'message': f'HAVEN relay will restart in {delay}s to apply changes'
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+def inspect_states(container_names):
+    """Fetch `.State` for many containers with one engine call.
+
+    Returns {container name: state}; containers the engine doesn't know are
+    left out rather than failing the others.
+    """
+    if not container_names:
+        return {}
+    result = subprocess.run(
+        [CONTAINER_RUNTIME, 'inspect', '-f', '{{.Name}}\t{{json .State}}', *container_names],
+        capture_output=True,
+        text=True,
+        timeout=10
+    )
+    states = {}
+    for line in result.stdout.splitlines():
+        name, _, state = line.partition('\t')
+        if state:
+            states[name.lstrip('/')] = json.loads(state)
+    return states
+
+
+def describe_state(instance, state_info):
+    """Summarise an instance's container state the way /api/status reports it."""
+    status = state_info.get('Status', 'unknown')
+    health = state_info.get('Health', {})
+    health_status = health.get('Status', 'unknown') if health else 'unknown'
+
+    return {
+        'status': status,
+        'health': health_status,
+        'running': status == 'running' and health_status == 'healthy',
+        'configured': is_relay_configured(instance.config_dir),
+    }
+
+
+@app.route('/api/status', methods=['GET'])
+@app.route('/api/instances/<instance_name>/status', methods=['GET'])
+def get_status(instance_name=None):
+    """Get haven relay status"""
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
+    try:
+        state_info = inspect_states([instance.container_name]).get(instance.container_name)
+
+        if state_info is not None:
+            return jsonify({'success': True, **describe_state(instance, state_info)})
         else:
             return jsonify({'success': False, 'error': 'Could not get status'}), 500
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-# Import state management
-import_status = {'status': 'idle', 'message': ''}
-import_log_queue = queue.Queue()
-import_state_lock = threading.Lock()
-import_control = {
-    'thread': None,
-    'process': None,
-    'cancel_event': None,
+
+@app.route('/api/instances', methods=['GET'])
+def get_instances():
+    """List the relay instances this UI manages"""
+    with instances_lock:
+        instances = [
+            {**instance.to_dict(), 'default': instance is DEFAULT_INSTANCE}
+            for instance in relay_instances.values()
+        ]
+    return jsonify({'success': True, 'instances': instances})
+
+
+@app.route('/api/instances', methods=['POST'])
+def add_instance():
+    """Register another relay instance"""
+    try:
+        instance = instance_from_dict(request.get_json(silent=True) or {})
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    if not instance.data_dir:
+        return jsonify({'success': False, 'error': 'A host data directory is required'}), 400
+    if not instance.config_dir.is_dir():
+        return jsonify({
+            'success': False,
+            'error': f'Config directory {instance.config_dir} is not mounted into the config UI'
+        }), 400
+    # Restarts wait for the relay to accept connections at host:port, which
+    # only works if the config UI shares a network with it
+    try:
+        socket.getaddrinfo(instance.host, instance.port)
+    except OSError:
+        return jsonify({
+            'success': False,
+            'error': f'{instance.host} does not resolve from the config UI. Make sure the relay is running '
+                     'and that the config UI is attached to its network (see README)'
+        }), 400
+
+    try:
+        with instances_lock:
+            if instance.name in relay_instances:
+                return jsonify({'success': False, 'error': f'Instance {instance.name} already exists'}), 400
+            if any(other.container_name == instance.container_name for other in relay_instances.values()):
+                return jsonify({'success': False, 'error': f'Container {instance.container_name} is already managed'}), 400
+            relay_instances[instance.name] = instance
+            save_instances()
+
+        if load_applied_fingerprint(instance) is None:
+            mark_config_applied(config_fingerprint(instance), instance)
+        return jsonify({'success': True, 'instance': instance.to_dict()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/instances/<instance_name>', methods=['DELETE'])
+def remove_instance(instance_name):
+    """Stop managing a relay instance (the relay itself is left untouched)"""
+    if instance_name == DEFAULT_INSTANCE_NAME:
+        return jsonify({'success': False, 'error': 'The default instance cannot be removed'}), 400
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
+    if 'running' in (instance.restart_status['status'], instance.import_status['status']):
+        return jsonify({'success': False, 'error': 'Wait for the running restart or import to finish'}), 400
+    try:
+        with instances_lock:
+            relay_instances.pop(instance_name, None)
+            save_instances()
+        return jsonify({'success': True})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/instances/status', methods=['GET'])
+def get_instances_status():
+    """Status of every instance, from a single inspect call"""
+    with instances_lock:
+        instances = list(relay_instances.values())
+    try:
+        states = inspect_states([instance.container_name for instance in instances])
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    results = []
+    for instance in instances:
+        state_info = states.get(instance.container_name)
+        entry = {'name': instance.name, 'container': instance.container_name}
+        if state_info is None:
+            entry.update({'status': 'missing', 'health': 'unknown', 'running': False,
+                          'configured': is_relay_configured(instance.config_dir)})
+        else:
+            entry.update(describe_state(instance, state_info))
+        entry['restart'] = instance.restart_status['status']
+        entry['import'] = instance.import_status['status']
+        results.append(entry)
+    return jsonify({'success': True, 'instances': results})
+
+
+# Rolling restart across instances: at most `concurrency` relays are down at
+# once, and no further restarts are started once one fails.
+rolling_restart_lock = threading.Lock()
+rolling_restart_status = {'status': 'idle', 'message': '', 'results': {}}
+
+
+def restart_and_wait(instance, halt):
+    """Restart one instance and wait for it to accept connections again."""
+    if halt.is_set():
+        return {'status': 'skipped', 'message': 'Skipped after an earlier failure'}
+
+    error = start_restart(instance, 'rolling restart')
+    if error:
+        halt.set()
+        return {'status': 'failed', 'message': error}
+
+    instance.restart_thread.join()
+    result = dict(instance.restart_status)
+    if result['status'] != 'completed':
+        halt.set()
+    return result
+
+
+def run_rolling_restart(instances, concurrency):
+    """Background thread: restart the given instances, `concurrency` at a time."""
+    global rolling_restart_status
+
+    halt = threading.Event()
+    results = rolling_restart_status['results']
+
+    def restart_one(instance):
+        results[instance.name] = {'status': 'running', 'message': 'Restarting'}
+        results[instance.name] = restart_and_wait(instance, halt)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(restart_one, instances))
+
+    failed = [name for name, result in results.items() if result['status'] != 'completed']
+    if failed:
+        message = f"Restart failed or skipped for: {', '.join(failed)}"
+        rolling_restart_status = {'status': 'failed', 'message': message, 'results': results}
+    else:
+        message = f'Restarted {len(instances)} instance(s)'
+        rolling_restart_status = {'status': 'completed', 'message': message, 'results': results}
+
+
+@app.route('/api/instances/restart', methods=['GET'])
+def get_rolling_restart():
+    """Progress of the current (or last) rolling restart"""
+    return jsonify({'success': True, **rolling_restart_status})
+
+
+@app.route('/api/instances/restart', methods=['POST'])
+def rolling_restart():
+    """Restart several instances, a few at a time"""
+    global rolling_restart_status
+
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'error': 'Expected a JSON object'}), 400
+    try:
+        concurrency = int(data.get('concurrency', 1))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'concurrency must be a number'}), 400
+    concurrency = max(1, min(concurrency, INSTANCE_CONCURRENCY_LIMIT))
+
+    names = data.get('instances')
+    if names is not None and (
+        not isinstance(names, list) or not all(isinstance(name, str) for name in names)
+    ):
+        return jsonify({'success': False, 'error': 'instances must be a list of instance names'}), 400
+
+    with instances_lock:
+        names = names or list(relay_instances)
+        unknown = [name for name in names if name not in relay_instances]
+        instances = [relay_instances[name] for name in names if name in relay_instances]
+    if unknown:
+        return jsonify({'success': False, 'error': f"Unknown relay instance(s): {', '.join(unknown)}"}), 404
+
+    with rolling_restart_lock:
+        if rolling_restart_status['status'] == 'running':
+            return jsonify({'success': False, 'error': 'A rolling restart is already in progress'}), 400
+        rolling_restart_status = {
+            'status': 'running',
+            'message': f'Restarting {len(instances)} instance(s), {concurrency} at a time',
+            'results': {instance.name: {'status': 'pending', 'message': ''} for instance in instances},
+        }
+        threading.Thread(target=run_rolling_restart, args=(instances, concurrency), daemon=True).start()
+
+    return jsonify({'success': True, 'message': rolling_restart_status['message']})
+
+# Container resource statistics. Block and network I/O are stored as rates
+# (bytes/second), everything else as the value the engine reported.
+STATS_FIELDS = ('cpu', 'mem', 'mem_limit', 'block_read', 'block_write', 'net_rx', 'net_tx')
+
+# (seconds per sample, samples kept): 10 minutes at 1s, 2 hours at 10s and
+# 24 hours at 1 minute.
+STATS_RESOLUTIONS = ((1, 600), (10, 720), (60, 1440))
+
+# Seconds to wait before re-attaching to a container that is not running
+STATS_RETRY_SECONDS = 5
+
+# The engine's socket, as mounted into this container by docker-compose.yml
+ENGINE_SOCKET = os.getenv('ENGINE_SOCKET', '/var/run/docker.sock')
+
+
+class EngineConnection(http.client.HTTPConnection):
+    """HTTP connection to the engine API over its Unix socket."""
+
+    def __init__(self, socket_path=ENGINE_SOCKET, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def cpu_percent(raw, previous):
+    """CPU use the way `docker stats` computes it, from two raw samples."""
+    cpu = raw.get('cpu_stats') or {}
+    precpu = previous or raw.get('precpu_stats') or {}
+    cpu_delta = (cpu.get('cpu_usage') or {}).get('total_usage', 0) - \
+        (precpu.get('cpu_usage') or {}).get('total_usage', 0)
+    system_delta = cpu.get('system_cpu_usage', 0) - precpu.get('system_cpu_usage', 0)
+    if cpu_delta <= 0 or system_delta <= 0:
+        return 0.0
+    online = cpu.get('online_cpus') or len((cpu.get('cpu_usage') or {}).get('percpu_usage') or []) or 1
+    return cpu_delta / system_delta * online * 100.0
+
+
+def memory_usage(raw):
+    """(used, limit) in bytes; page cache is left out as `docker stats` does."""
+    memory = raw.get('memory_stats') or {}
+    stats = memory.get('stats') or {}
+    # cgroup v2 reports inactive_file, v1 total_inactive_file
+    cache = stats.get('inactive_file', stats.get('total_inactive_file', 0))
+    usage = memory.get('usage', 0)
+    used = usage - cache if cache < usage else usage
+    return float(used), float(memory.get('limit', 0))
+
+
+def io_counters(raw):
+    """Cumulative (block read, block write, net rx, net tx) byte counters."""
+    block_read = block_write = 0
+    for entry in (raw.get('blkio_stats') or {}).get('io_service_bytes_recursive') or []:
+        op = (entry.get('op') or '').lower()
+        if op == 'read':
+            block_read += entry.get('value', 0)
+        elif op == 'write':
+            block_write += entry.get('value', 0)
+    networks = (raw.get('networks') or {}).values()
+    net_rx = sum(network.get('rx_bytes', 0) for network in networks)
+    net_tx = sum(network.get('tx_bytes', 0) for network in networks)
+    return float(block_read), float(block_write), float(net_rx), float(net_tx)
+
+
+class StatsRing:
+    """Fixed-size ring of samples at a single resolution.
+
+    Samples live in preallocated flat arrays (one timestamp column plus one
+    column per STATS_FIELDS entry), so recording allocates nothing and memory
+    stays constant however long the collector runs.
+    """
+
+    def __init__(self, step, capacity):
+        self.step = step
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.columns = [array('d', bytes(8 * capacity)) for _ in STATS_FIELDS]
+        self.head = 0
+        self.count = 0
+
+    def append(self, timestamp, values):
+        index = self.head
+        self.times[index] = timestamp
+        for column, value in zip(self.columns, values):
+            column[index] = value
+        self.head = (index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def snapshot(self, since=0):
+        """Return the samples newer than `since`, oldest first, as plain lists."""
+        start = self.head - self.count
+        indexes = [(start + n) % self.capacity for n in range(self.count)]
+        indexes = [i for i in indexes if self.times[i] > since]
+        data = {'step': self.step, 'time': [self.times[i] for i in indexes]}
+        for name, column in zip(STATS_FIELDS, self.columns):
+            data[name] = [round(column[i], 2) for i in indexes]
+        return data
+
+
+class ContainerStats:
+    """Multi-resolution history for one container.
+
+    Each ring accumulates samples into a running sum for its current bucket
+    and stores the bucket's mean once a sample lands in the next one.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rings = [StatsRing(step, capacity) for step, capacity in STATS_RESOLUTIONS]
+        self._sums = [array('d', bytes(8 * len(STATS_FIELDS))) for _ in self.rings]
+        self._counts = [0] * len(self.rings)
+        self._buckets = [None] * len(self.rings)
+        self.latest = None
+
+    def record(self, timestamp, values):
+        with self.lock:
+            self.latest = {'time': timestamp, **dict(zip(STATS_FIELDS, values))}
+            for n, ring in enumerate(self.rings):
+                sums = self._sums[n]
+                bucket = int(timestamp // ring.step)
+                if bucket != self._buckets[n] and self._counts[n]:
+                    count = self._counts[n]
+                    ring.append(self._buckets[n] * ring.step, [total / count for total in sums])
+                    for i in range(len(sums)):
+                        sums[i] = 0.0
+                    self._counts[n] = 0
+                self._buckets[n] = bucket
+                for i, value in enumerate(values):
+                    sums[i] += value
+                self._counts[n] += 1
+
+    def snapshot(self, step, since=0):
+        with self.lock:
+            for ring in self.rings:
+                if ring.step == step:
+                    data = ring.snapshot(since)
+                    data['latest'] = self.latest
+                    return data
+        raise ValueError(f'Unknown resolution: {step}')
+
+
+class StatsCollector:
+    """Follows the engine API's streaming stats for one container.
+
+    The engine pushes a sample about once a second over a single long-lived
+    connection, so collecting costs one blocked readline and a JSON decode per
+    second - nothing is polled or spawned per sample. The samples carry raw
+    byte counters, so I/O rates stay exact however large the totals grow.
+    """
+
+    def __init__(self, container_name):
+        self.container_name = container_name
+        self.history = ContainerStats()
+        self._stop_event = threading.Event()
+        self._connection = None
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop_event,), daemon=True,
+            name=f'stats-{self.container_name}'
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        connection = self._connection
+        if connection and connection.sock:
+            try:
+                # Unblocks the collector thread's read
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _run(self, stop_event):
+        while not stop_event.is_set():
+            try:
+                self._follow(stop_event)
+            except Exception as e:
+                print(f"Stats collector for {self.container_name} failed: {e}", flush=True)
+            # The container may be restarting or not created yet
+            stop_event.wait(STATS_RETRY_SECONDS)
+
+    def _follow(self, stop_event):
+        connection = EngineConnection()
+        self._connection = connection
+        previous = None
+
+        try:
+            connection.request('GET', f'/containers/{self.container_name}/stats?stream=true')
+            response = connection.getresponse()
+            if response.status != 200:
+                raise Exception(f'engine returned {response.status}')
+
+            for line in response:
+                if stop_event.is_set():
+                    break
+                try:
+                    raw = json.loads(line)
+                except ValueError:
+                    continue
+
+                now = time.time()
+                mem, mem_limit = memory_usage(raw)
+                counters = io_counters(raw)
+                if previous is None:
+                    rates = (0.0,) * len(counters)
+                    cpu = cpu_percent(raw, None)
+                else:
+                    elapsed = max(now - previous[0], 0.001)
+                    # Counters reset when the container restarts; clamp at 0
+                    rates = tuple(
+                        max(current - last, 0.0) / elapsed
+                        for current, last in zip(counters, previous[1])
+                    )
+                    cpu = cpu_percent(raw, previous[2])
+                previous = (now, counters, raw.get('cpu_stats'))
+                self.history.record(now, (cpu, mem, mem_limit) + rates)
+        finally:
+            self._connection = None
+            connection.close()
+
+
+stats_collectors = {
+    'relay': StatsCollector(RELAY_CONTAINER_NAME),
+    'import': DEFAULT_INSTANCE.import_stats(),
 }
 
 
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Get recorded CPU, memory, block I/O and network usage per container"""
+    try:
+        resolution = int(request.args.get('resolution', STATS_RESOLUTIONS[0][0]))
+        since = float(request.args.get('since', 0))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid resolution or since value'}), 400
+
+    if resolution not in [step for step, _ in STATS_RESOLUTIONS]:
+        return jsonify({'success': False, 'error': f'Unsupported resolution: {resolution}'}), 400
+
+    try:
+        containers = {}
+        for key, collector in stats_collectors.items():
+            containers[key] = {
+                'name': collector.container_name,
+                'collecting': collector.is_running(),
+                **collector.history.snapshot(resolution, since),
+            }
+        return jsonify({
+            'success': True,
+            'fields': list(STATS_FIELDS),
+            'resolutions': [{'step': step, 'samples': samples} for step, samples in STATS_RESOLUTIONS],
+            'containers': containers,
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Runtime discovery for the import helper. The helper reuses the relay's
+# image, network and mounts; they are read with one `inspect` and cached
+# until an engine event says the relay container (or its networks) changed.
+# The cache is only trusted while the event stream is being followed.
+IMPORT_WARM_HELPER = os.getenv('IMPORT_WARM_HELPER', '').strip().lower() in ('1', 'true', 'yes')
+IMPORT_HELPER_SPEC_LABEL = 'haven-kit.helper-spec'
+# Sanitised copy of the .env passed to the helper with --env-file
+IMPORT_ENV_FILE = ".env.import"
+
+# Container actions that can change a container's image, mounts or networks
+RUNTIME_CHANGE_ACTIONS = {'create', 'destroy', 'rename', 'update'}
+
+runtime_cache_lock = threading.Lock()
+runtime_cache = {}
+
+
+class EngineEventWatcher:
+    """Follows `events` to invalidate cached container details.
+
+    One long-lived `events` process replaces a round of `inspect` calls per
+    import; cached entries are dropped when the engine reports a change.
+    """
+
+    def __init__(self):
+        self._process = None
+        self._thread = None
+
+    def is_following(self):
+        process = self._process
+        return process is not None and process.poll() is None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True, name='engine-events')
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self._follow()
+            except Exception as e:
+                print(f"Engine event watcher failed: {e}", flush=True)
+            # Anything may have changed while nothing was listening
+            with runtime_cache_lock:
+                runtime_cache.clear()
+            time.sleep(STATS_RETRY_SECONDS)
+
+    def _follow(self):
+        process = subprocess.Popen(
+            [CONTAINER_RUNTIME, 'events', '--format', '{{json .}}',
+             '--filter', 'type=container', '--filter', 'type=network'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self._process = process
+        try:
+            for line in process.stdout:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                handle_engine_event(event)
+        finally:
+            self._process = None
+            if process.poll() is None:
+                process.terminate()
+
+
+engine_events = EngineEventWatcher()
+
+
+def handle_engine_event(event):
+    """Drop cached details, and track warm helpers, as the engine reports changes."""
+    action = (event.get('Action') or event.get('status') or '').split(':')[0]
+    actor = event.get('Actor') or {}
+    attributes = actor.get('Attributes') or {}
+
+    if event.get('Type') == 'network':
+        # connect/disconnect name the container by ID
+        container_id = attributes.get('container', '')
+        with runtime_cache_lock:
+            for name, info in list(runtime_cache.items()):
+                if container_id and info['id'].startswith(container_id):
+                    del runtime_cache[name]
+        return
+
+    name = attributes.get('name', '')
+    if action in RUNTIME_CHANGE_ACTIONS:
+        with runtime_cache_lock:
+            runtime_cache.pop(name, None)
+
+    for instance in list(relay_instances.values()):
+        if name != instance.import_container_name:
+            continue
+        if action == 'create':
+            instance.warm_helper['spec'] = attributes.get(IMPORT_HELPER_SPEC_LABEL)
+        elif action == 'destroy':
+            instance.warm_helper['spec'] = None
+
+
+def relay_runtime(instance):
+    """Image, networks and mounts of an instance's relay container (cached).
+
+    Raises if the container can't be inspected.
+    """
+    with runtime_cache_lock:
+        cached = runtime_cache.get(instance.container_name)
+    if cached and engine_events.is_following():
+        return cached
+
+    result = subprocess.run(
+        [CONTAINER_RUNTIME, 'inspect', instance.container_name],
+        capture_output=True,
+        text=True,
+        timeout=10
+    )
+    if result.returncode != 0:
+        raise Exception(f'Failed to inspect relay: {result.stderr.strip()}')
+    details = json.loads(result.stdout)[0]
+
+    info = {
+        'id': details.get('Id', ''),
+        'image': (details.get('Config') or {}).get('Image', ''),
+        # Sorted so the relay's own network comes before overlay ones
+        # (e.g. haven-kit_haven_network before haven-kit_tor_net)
+        'networks': sorted(((details.get('NetworkSettings') or {}).get('Networks') or {}).keys()),
+        'mounts': [
+            {
+                'type': mount.get('Type'),
+                'source': mount.get('Name') if mount.get('Type') == 'volume' else mount.get('Source'),
+                'destination': mount.get('Destination'),
+                'rw': mount.get('RW', True),
+            }
+            for mount in details.get('Mounts') or []
+        ],
+    }
+    with runtime_cache_lock:
+        runtime_cache[instance.container_name] = info
+    return info
+
+
+def write_import_env_file(instance):
+    """Write the instance's .env as a plain KEY=value file for --env-file.
+
+    `--env-file` takes values literally, so quotes are stripped here the way
+    the shell would. The file is only rewritten when its contents change.
+    """
+    env_file = instance.config_dir / IMPORT_ENV_FILE
+    env = parse_env_text(instance.env_file.read_text()) if instance.env_file.exists() else {}
+    content = ''.join(f'{key}={value}\n' for key, value in env.items())
+    try:
+        if env_file.read_text() == content:
+            return env_file, len(env)
+    except OSError:
+        pass
+    env_file.write_text(content)
+    return env_file, len(env)
+
+
+def import_helper_args(instance, limits, log=None):
+    """Arguments for `run`/`create` of the import helper, minus the command.
+
+    Returns (args, number of env vars). Raises if neither the relay's mounts
+    nor a data directory are known. Progress messages go to the `log` queue,
+    if one is given.
+    """
+    args = []
+    runtime = None
+    try:
+        runtime = relay_runtime(instance)
+    except Exception as e:
+        print(f"Failed to inspect relay {instance.container_name}: {e}", flush=True)
+
+    # Reuse the relay's volume layout; fall back to the data dir convention
+    mounts = runtime['mounts'] if runtime else []
+    if mounts:
+        for mount in mounts:
+            options = 'z' if mount['rw'] else 'ro,z'
+            if mount['type'] == 'volume':
+                options = 'rw' if mount['rw'] else 'ro'
+            args.extend(['-v', f"{mount['source']}:{mount['destination']}:{options}"])
+    else:
+        app_data_dir = instance.data_dir
+        if not app_data_dir:
+            raise Exception(f'No data directory configured for relay instance {instance.name}')
+        args.extend([
+            '-v', f'{app_data_dir}/config:/haven-config:z',
+            '-v', f'{app_data_dir}/blossom:/haven/blossom:z',
+            '-v', f'{app_data_dir}/db:/haven/db:z',
+        ])
+
+    # Determine the network used by the relay so the import container can connect
+    relay_network = os.getenv('RELAY_NETWORK', '').strip()
+    if not relay_network and runtime and runtime['networks']:
+        relay_network = runtime['networks'][0]
+    if not relay_network:
+        relay_network = 'haven-kit_haven_network'
+        if log:
+            log.put({'type': 'warning', 'message': 'Could not detect relay network, falling back to haven-kit_haven_network'})
+    args.extend(['--network', relay_network])
+
+    args.extend(import_limit_args(instance, limits, log))
+
+    env_file, env_count = write_import_env_file(instance)
+    args.extend(['--env-file', str(env_file)])
+
+    # Determine relay image to reuse for import container
+    relay_image = os.getenv('RELAY_IMAGE_NAME', '').strip()
+    if not relay_image and runtime:
+        relay_image = runtime['image']
+    if not relay_image:
+        relay_image = 'localhost/haven-kit_haven_relay:latest'
+        if log:
+            log.put({'type': 'warning', 'message': 'Could not detect relay image, falling back to localhost/haven-kit_haven_relay:latest'})
+    args.append(relay_image)
+
+    return args, env_count
+
+
+def helper_spec(args):
+    """Identifies a helper's arguments, including the env file's contents."""
+    digest = hashlib.sha256(json.dumps(args).encode())
+    for index, arg in enumerate(args[:-1]):
+        if arg == '--env-file':
+            digest.update(Path(args[index + 1]).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def prepare_warm_helper(instance):
+    """Create (but don't start) the import helper so the next import skips it.
+
+    Uses the limits of the last import, which is what a scheduled job will
+    ask for again. Failures just leave the next import to a cold start. This
+    runs after an import has finished (and at startup), so it keeps out of
+    the import log.
+    """
+    with instance.warm_helper_lock:
+        try:
+            args, _ = import_helper_args(instance, instance.warm_helper['limits'])
+            spec = helper_spec(args)
+            if instance.warm_helper['spec'] == spec:
+                return
+            subprocess.run(
+                [CONTAINER_RUNTIME, 'rm', '-f', instance.import_container_name],
+                capture_output=True,
+                text=True,
+                timeout=15
+            )
+            result = subprocess.run(
+                [CONTAINER_RUNTIME, 'create', '--rm',
+                 '--name', instance.import_container_name,
+                 '--label', f'{IMPORT_HELPER_SPEC_LABEL}={spec}',
+                 *args, '/haven/haven', '--import'],
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+            if result.returncode != 0:
+                raise Exception(result.stderr.strip())
+            instance.warm_helper['spec'] = spec
+        except Exception as e:
+            instance.warm_helper['spec'] = None
+            print(f"Failed to prepare import helper for {instance.name}: {e}", flush=True)
+
+
+def import_helper_command(instance, limits):
+    """Command that runs the import: the warm helper if it matches, else `run`."""
+    with instance.warm_helper_lock:
+        args, env_count = import_helper_args(instance, limits, instance.import_log_queue)
+        spec = helper_spec(args)
+        instance.warm_helper['limits'] = limits
+
+        if IMPORT_WARM_HELPER and instance.warm_helper['spec'] == spec:
+            # `create --rm` means it is removed once this run exits
+            instance.warm_helper['spec'] = None
+            instance.import_log_queue.put({'type': 'info', 'message': 'Starting pre-created import helper'})
+            return [CONTAINER_RUNTIME, 'start', '-a', instance.import_container_name], env_count
+
+        # Clear out a helper left behind by a crashed run (or a warm helper
+        # with outdated arguments) so the fixed name below is free
+        subprocess.run(
+            [CONTAINER_RUNTIME, 'rm', '-f', instance.import_container_name],
+            capture_output=True,
+            text=True,
+            timeout=15
+        )
+        instance.warm_helper['spec'] = None
+        return [
+            CONTAINER_RUNTIME, 'run', '--rm',
+            '--name', instance.import_container_name,
+            *args, '/haven/haven', '--import'
+        ], env_count
+
+
+# Imports run against one relay instance at a time; the state lives on the
+# instance (see RelayInstance).
 @app.route('/api/import/info', methods=['GET'])
-def get_import_info():
+@app.route('/api/instances/<instance_name>/import/info', methods=['GET'])
+def get_import_info(instance_name=None):
     """Get import configuration information"""
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
     try:
-        ensure_config_files()
+        if instance is DEFAULT_INSTANCE:
+            ensure_config_files()
 
         # Read import relays
-        relays = json.loads(RELAYS_IMPORT_FILE.read_text())
+        relays = json.loads((instance.config_dir / RELAYS_IMPORT_FILE.name).read_text())
         relay_count = len(relays)
 
         # Read import start date from .env
-        env_content = ENV_FILE.read_text()
+        env_content = instance.env_file.read_text()
         import_start_date = None
         for line in env_content.split('\n'):
             if line.strip().startswith('IMPORT_START_DATE='):
@@ -364,34 +1694,35 @@ def get_import_info():
             'success': True,
             'relay_count': relay_count,
             'import_start_date': import_start_date or 'Not set',
-            'status': import_status['status'],
-            'message': import_status['message']
+            'status': instance.import_status['status'],
+            'message': instance.import_status['message']
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-def run_import_process(cancel_event):
+def run_import_process(instance, cancel_event, limits=None):
     """Background thread to run the import process"""
-    global import_status, import_control
+    limits = limits or {}
 
     print("run_import_process: Function started", flush=True)
-    import_status = {'status': 'running', 'message': 'Starting import...'}
-    import_log_queue.put({'type': 'info', 'message': 'Starting import process...'})
+    instance.import_status = {'status': 'running', 'message': 'Starting import...'}
+    instance.import_log_queue.put({'type': 'info', 'message': 'Starting import process...'})
 
     runtime_cmd = CONTAINER_RUNTIME
     print(f"run_import_process: Using runtime {runtime_cmd}", flush=True)
-    import_log_queue.put({'type': 'info', 'message': f'Using container runtime: {runtime_cmd}'})
+    instance.import_log_queue.put({'type': 'info', 'message': f'Using container runtime: {runtime_cmd}'})
 
     cancelled = False
     completed_requested = False
     import_result = None
+    import_stats = instance.import_stats()
 
     try:
         # Step 1: Stop the relay
-        import_log_queue.put({'type': 'info', 'message': 'Stopping HAVEN relay...'})
+        instance.import_log_queue.put({'type': 'info', 'message': 'Stopping HAVEN relay...'})
         stop_result = subprocess.run(
-            [runtime_cmd, 'stop', RELAY_CONTAINER_NAME],
+            [runtime_cmd, 'stop', instance.container_name],
             capture_output=True,
             text=True,
             timeout=30
@@ -400,88 +1731,19 @@ def run_import_process(cancel_event):
         if stop_result.returncode != 0:
             raise Exception(f'Failed to stop relay: {stop_result.stderr}')
 
-        import_log_queue.put({'type': 'success', 'message': 'HAVEN relay stopped'})
+        instance.import_log_queue.put({'type': 'success', 'message': 'HAVEN relay stopped'})
         time.sleep(2)
 
         if cancel_event.is_set():
             cancelled = True
-            import_log_queue.put({'type': 'warning', 'message': 'Import cancelled before running haven --import'})
+            instance.import_log_queue.put({'type': 'warning', 'message': 'Import cancelled before running haven --import'})
 
         if not cancelled:
-            # Resolve APP_DATA_DIR relative to current working directory if needed
-            app_data_dir = os.getenv('APP_DATA_DIR', './data')
-            if not os.path.isabs(app_data_dir):
-                app_data_dir = os.path.abspath(os.path.join(os.getcwd(), app_data_dir))
-
-            # Read environment variables from .env file (accessible via mounted volume)
-            env_args = []
-            env_file_path = '/haven-config/.env'
-            if Path(env_file_path).exists():
-                with open(env_file_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            key, value = line.split('=', 1)
-                            value = value.strip('"').strip("'")
-                            env_args.extend(['-e', f'{key}={value}'])
-
-            # Determine relay image to reuse for import container
-            relay_image = os.getenv('RELAY_IMAGE_NAME', '').strip()
-            if not relay_image:
-                try:
-                    inspect_image = subprocess.run(
-                        [runtime_cmd, 'inspect', '-f', '{{.Config.Image}}', RELAY_CONTAINER_NAME],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    if inspect_image.returncode == 0:
-                        relay_image = inspect_image.stdout.strip()
-                except Exception as e:
-                    print(f"Failed to detect relay image: {e}", flush=True)
-
-            if not relay_image:
-                relay_image = 'localhost/haven-kit_haven_relay:latest'
-                import_log_queue.put({'type': 'warning', 'message': 'Could not detect relay image, falling back to localhost/haven-kit_haven_relay:latest'})
-
-            # Determine the network used by the relay so the import container can connect
-            relay_network = os.getenv('RELAY_NETWORK', '').strip()
-            if not relay_network:
-                try:
-                    inspect_network = subprocess.run(
-                        [runtime_cmd, 'inspect', '-f', '{{range $k, $_ := .NetworkSettings.Networks}}{{$k}}{{end}}', RELAY_CONTAINER_NAME],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    if inspect_network.returncode == 0:
-                        relay_network = inspect_network.stdout.strip()
-                except Exception as e:
-                    print(f"Failed to detect relay network: {e}", flush=True)
-
-            if not relay_network:
-                relay_network = 'haven-kit_haven_network'
-                import_log_queue.put({'type': 'warning', 'message': 'Could not detect relay network, falling back to haven-kit_haven_network'})
-
-            # Use podman run to create a temporary container for import
-            cmd = [
-                runtime_cmd, 'run', '--rm',
-                '-v', f'{app_data_dir}/config:/haven-config:z',
-                '-v', f'{app_data_dir}/blossom:/haven/blossom:z',
-                '-v', f'{app_data_dir}/db:/haven/db:z',
-                '--network', relay_network,
-            ]
-            cmd.extend(env_args)
-            cmd.extend([
-                relay_image,
-                '/haven/haven', '--import'
-            ])
+            cmd, env_count = import_helper_command(instance, limits)
 
             cmd_preview = ' '.join(cmd[:20])
             print(f"Running import command: {cmd_preview}...", flush=True)
-            print(f"app_data_dir resolved to: {app_data_dir}", flush=True)
-            import_log_queue.put({'type': 'info', 'message': f'Executing import with {len(env_args)//2} environment variables'})
-            import_log_queue.put({'type': 'info', 'message': f'Data directory: {app_data_dir}'})
+            instance.import_log_queue.put({'type': 'info', 'message': f'Executing import with {env_count} environment variables'})
 
             import_result = subprocess.Popen(
                 cmd,
@@ -491,32 +1753,40 @@ def run_import_process(cancel_event):
                 bufsize=1
             )
 
-            with import_state_lock:
-                import_control['process'] = import_result
+            with instance.import_state_lock:
+                instance.import_control['process'] = import_result
+
+            # A cancel that arrived while the helper was being set up had no
+            # process to signal
+            if cancel_event.is_set():
+                import_result.send_signal(signal.SIGINT)
 
             print(f"Import subprocess started with PID {import_result.pid}", flush=True)
+            import_stats.start()
 
             try:
                 for line in import_result.stdout:
                     line = line.strip()
                     if line:
                         print(f"Import output: {line}", flush=True)
-                        import_log_queue.put({'type': 'info', 'message': line})
+                        instance.import_log_queue.put({'type': 'info', 'message': line})
 
                     normalized_line = line.lower()
 
                     if cancel_event.is_set():
                         if not cancelled:
-                            import_log_queue.put({'type': 'warning', 'message': 'Cancellation requested, stopping import process...'})
+                            instance.import_log_queue.put({'type': 'warning', 'message': 'Cancellation requested, stopping import process...'})
                         cancelled = True
                         break
 
                     if not cancelled and not completed_requested:
                         if 'tagged import complete' in normalized_line or 'please restart the relay' in normalized_line:
                             completed_requested = True
-                            import_log_queue.put({'type': 'info', 'message': 'Import reported completion. Shutting down helper process...'})
+                            instance.import_log_queue.put({'type': 'info', 'message': 'Import reported completion. Shutting down helper process...'})
                             break
 
+                cancelled = cancelled or cancel_event.is_set()
+
                 if import_result.poll() is None:
                     if cancelled:
                         try:
@@ -537,11 +1807,11 @@ def run_import_process(cancel_event):
                         import_result.wait(timeout=wait_timeout)
                     except subprocess.TimeoutExpired:
                         if cancelled or completed_requested:
-                            import_log_queue.put({'type': 'warning', 'message': 'Import process did not exit gracefully, forcing termination...'})
+                            instance.import_log_queue.put({'type': 'warning', 'message': 'Import process did not exit gracefully, forcing termination...'})
                             import_result.kill()
                             import_result.wait(timeout=10)
                         else:
-                            import_log_queue.put({'type': 'warning', 'message': 'Import timed out, attempting graceful shutdown...'})
+                            instance.import_log_queue.put({'type': 'warning', 'message': 'Import timed out, attempting graceful shutdown...'})
                             import_result.send_signal(signal.SIGINT)
                             import_result.wait(timeout=15)
 
@@ -551,17 +1821,19 @@ def run_import_process(cancel_event):
                     raise Exception(error_msg)
 
                 if not cancelled and not completed_requested:
-                    import_log_queue.put({'type': 'success', 'message': 'Import completed successfully'})
+                    instance.import_log_queue.put({'type': 'success', 'message': 'Import completed successfully'})
                     time.sleep(1)
 
             finally:
-                with import_state_lock:
-                    import_control['process'] = None
+                import_stats.stop()
+                with instance.import_state_lock:
+                    instance.import_control['process'] = None
 
         # Step 3: Restart the relay (always attempt)
-        import_log_queue.put({'type': 'info', 'message': 'Starting HAVEN relay...'})
+        instance.import_log_queue.put({'type': 'info', 'message': 'Starting HAVEN relay...'})
+        fingerprint = config_fingerprint(instance)
         start_result = subprocess.run(
-            [runtime_cmd, 'start', RELAY_CONTAINER_NAME],
+            [runtime_cmd, 'start', instance.container_name],
             capture_output=True,
             text=True,
             timeout=30
@@ -570,97 +1842,140 @@ def run_import_process(cancel_event):
         if start_result.returncode != 0:
             raise Exception(f'Failed to start relay: {start_result.stderr}')
 
-        import_log_queue.put({'type': 'success', 'message': 'HAVEN relay started'})
+        mark_config_applied(fingerprint, instance)
+
+        instance.import_log_queue.put({'type': 'success', 'message': 'HAVEN relay started'})
 
         if cancelled:
-            import_log_queue.put({'type': 'warning', 'message': 'Import cancelled by user'})
-            import_status = {'status': 'cancelled', 'message': 'Import cancelled by user'}
+            instance.import_log_queue.put({'type': 'warning', 'message': 'Import cancelled by user'})
+            instance.import_status = {'status': 'cancelled', 'message': 'Import cancelled by user'}
         else:
             if completed_requested:
-                import_log_queue.put({'type': 'success', 'message': 'Import completed successfully'})
+                instance.import_log_queue.put({'type': 'success', 'message': 'Import completed successfully'})
                 time.sleep(1)
-            import_log_queue.put({'type': 'success', 'message': '✓ Import process completed successfully!'})
-            import_status = {'status': 'completed', 'message': 'Import completed successfully'}
+            instance.import_log_queue.put({'type': 'success', 'message': '✓ Import process completed successfully!'})
+            instance.import_status = {'status': 'completed', 'message': 'Import completed successfully'}
 
     except Exception as e:
         cancelled = cancelled or cancel_event.is_set()
         error_msg = str(e)
 
         if cancelled:
-            import_log_queue.put({'type': 'warning', 'message': f'Import cancelled: {error_msg}'})
-            import_status = {'status': 'cancelled', 'message': 'Import cancelled by user'}
+            instance.import_log_queue.put({'type': 'warning', 'message': f'Import cancelled: {error_msg}'})
+            instance.import_status = {'status': 'cancelled', 'message': 'Import cancelled by user'}
         else:
-            import_log_queue.put({'type': 'error', 'message': f'Import failed: {error_msg}'})
-            import_status = {'status': 'failed', 'message': error_msg}
+            instance.import_log_queue.put({'type': 'error', 'message': f'Import failed: {error_msg}'})
+            instance.import_status = {'status': 'failed', 'message': error_msg}
 
         try:
-            subprocess.run([runtime_cmd, 'start', RELAY_CONTAINER_NAME], timeout=30)
+            subprocess.run([runtime_cmd, 'start', instance.container_name], timeout=30)
             if cancelled:
-                import_log_queue.put({'type': 'warning', 'message': 'HAVEN relay restarted after cancellation'})
+                instance.import_log_queue.put({'type': 'warning', 'message': 'HAVEN relay restarted after cancellation'})
             else:
-                import_log_queue.put({'type': 'warning', 'message': 'HAVEN relay restarted after error'})
+                instance.import_log_queue.put({'type': 'warning', 'message': 'HAVEN relay restarted after error'})
         except Exception:
-            import_log_queue.put({'type': 'error', 'message': 'Failed to restart HAVEN relay'})
+            instance.import_log_queue.put({'type': 'error', 'message': 'Failed to restart HAVEN relay'})
 
     finally:
-        with import_state_lock:
-            import_control['process'] = None
-            import_control['thread'] = None
-            import_control['cancel_event'] = None
-
+        with instance.import_state_lock:
+            instance.import_control['process'] = None
+            instance.import_control['thread'] = None
+            instance.import_control['cancel_event'] = None
+
+
+def parse_import_limits(data):
+    """Validate per-run limits for the import helper (raises ValueError)."""
+    limits = {}
+    if data.get('max_relays') not in (None, ''):
+        limits['max_relays'] = int(data['max_relays'])
+        if limits['max_relays'] < 1:
+            raise ValueError('max_relays must be at least 1')
+    if data.get('cpus') not in (None, ''):
+        limits['cpus'] = float(data['cpus'])
+        if limits['cpus'] <= 0:
+            raise ValueError('cpus must be greater than 0')
+    return limits
+
+
+def import_limit_args(instance, limits, log=None):
+    """Extra `run` arguments that throttle the import helper.
+
+    `cpus` caps the helper's CPU share (and with it how fast it can pull and
+    store events). `max_relays` caps its outbound connections by pointing
+    Haven at the first N seed relays only; the relay entrypoint honours
+    IMPORT_RUN_SEED_RELAYS_FILE over the .env's IMPORT_SEED_RELAYS_FILE.
+    """
+    args = []
+    if limits.get('cpus'):
+        args.extend(['--cpus', str(limits['cpus'])])
+        if log:
+            log.put({'type': 'info', 'message': f"Limiting import helper to {limits['cpus']} CPUs"})
+    if limits.get('max_relays'):
+        relays = json.loads((instance.config_dir / RELAYS_IMPORT_FILE.name).read_text())
+        (instance.config_dir / IMPORT_RUN_RELAYS_FILE).write_text(
+            json.dumps(relays[:limits['max_relays']], indent=2)
+        )
+        args.extend(['-e', f'IMPORT_RUN_SEED_RELAYS_FILE=/haven-config/{IMPORT_RUN_RELAYS_FILE}'])
+        if log:
+            log.put({
+                'type': 'info',
+                'message': f"Importing from {min(len(relays), limits['max_relays'])} of {len(relays)} seed relays"
+            })
+    return args
 
-@app.route('/api/import/run', methods=['POST'])
-def run_import():
-    """Trigger the import process"""
-    global import_status, import_control
 
-    if import_status['status'] == 'running':
-        return jsonify({'success': False, 'error': 'Import is already running'}), 400
+def start_import(instance, limits=None, trigger='manual', job=None):
+    """Start an import in the background; returns an error string or None."""
+    with instance.operation_lock, instance.import_state_lock:
+        if instance.import_status['status'] == 'running':
+            return 'Import is already running'
 
-    # Clear the log queue
-    while not import_log_queue.empty():
-        try:
-            import_log_queue.get_nowait()
-        except queue.Empty:
-            break
+        if instance.restart_status['status'] == 'running':
+            return 'The relay is restarting; try again once it is back up'
 
-    # Start import in background thread
-    cancel_event = threading.Event()
+        # Clear the log queue
+        while not instance.import_log_queue.empty():
+            try:
+                instance.import_log_queue.get_nowait()
+            except queue.Empty:
+                break
 
-    with import_state_lock:
-        import_control['cancel_event'] = cancel_event
-        import_control['process'] = None
+        # Claim the instance now so a scheduled run can't start alongside
+        instance.import_status = {'status': 'running', 'message': 'Starting import...'}
 
-    thread = threading.Thread(target=run_import_process, args=(cancel_event,), daemon=True)
+        # Start import in background thread
+        cancel_event = threading.Event()
+        instance.import_control['cancel_event'] = cancel_event
+        instance.import_control['process'] = None
 
-    with import_state_lock:
-        import_control['thread'] = thread
+        thread = threading.Thread(
+            target=run_import_job,
+            args=(instance, cancel_event, limits or {}, trigger, job),
+            daemon=True
+        )
+        instance.import_control['thread'] = thread
 
     thread.start()
+    return None
 
-    return jsonify({'success': True, 'message': 'Import started'})
 
+def request_import_cancel(instance, message):
+    """Ask the running import to stop; returns an error string or None."""
+    if instance.import_status['status'] != 'running':
+        return 'No import is currently running'
 
-@app.route('/api/import/cancel', methods=['POST'])
-def cancel_import():
-    """Request cancellation of the running import process"""
-    global import_status, import_control
-
-    if import_status['status'] != 'running':
-        return jsonify({'success': False, 'error': 'No import is currently running'}), 400
-
-    with import_state_lock:
-        cancel_event = import_control.get('cancel_event')
-        process = import_control.get('process')
+    with instance.import_state_lock:
+        cancel_event = instance.import_control.get('cancel_event')
+        process = instance.import_control.get('process')
 
     if cancel_event is None:
-        return jsonify({'success': False, 'error': 'Import control state not available'}), 400
+        return 'Import control state not available'
 
     if cancel_event.is_set():
-        return jsonify({'success': False, 'error': 'Cancellation is already in progress'}), 400
+        return 'Cancellation is already in progress'
 
     cancel_event.set()
-    import_log_queue.put({'type': 'warning', 'message': 'Cancellation requested by user. Stopping import...'})
+    instance.import_log_queue.put({'type': 'warning', 'message': message})
 
     if process and process.poll() is None:
         try:
@@ -670,33 +1985,72 @@ def cancel_import():
                 process.terminate()
             except Exception:
                 pass
+    return None
+
+
+@app.route('/api/import/run', methods=['POST'])
+@app.route('/api/instances/<instance_name>/import/run', methods=['POST'])
+def run_import(instance_name=None):
+    """Trigger the import process, optionally with per-run limits"""
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
+
+    try:
+        limits = parse_import_limits(request.get_json(silent=True) or {})
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    error = start_import(instance, limits)
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+
+    return jsonify({'success': True, 'message': 'Import started'})
+
+
+@app.route('/api/import/cancel', methods=['POST'])
+@app.route('/api/instances/<instance_name>/import/cancel', methods=['POST'])
+def cancel_import(instance_name=None):
+    """Request cancellation of the running import process"""
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
+
+    error = request_import_cancel(instance, 'Cancellation requested by user. Stopping import...')
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
 
     return jsonify({'success': True, 'message': 'Import cancellation requested'})
 
 
 @app.route('/api/import/stream')
-def import_stream():
+@app.route('/api/instances/<instance_name>/import/stream')
+def import_stream(instance_name=None):
     """Stream import logs using Server-Sent Events"""
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
+
     def generate():
         # Send initial status
-        yield f"data: {json.dumps({'type': 'status', 'status': import_status['status']})}\n\n"
+        yield f"data: {json.dumps({'type': 'status', 'status': instance.import_status['status']})}\n\n"
 
         # Stream logs
         while True:
             try:
                 # Wait for new log with timeout
-                log = import_log_queue.get(timeout=1)
+                log = instance.import_log_queue.get(timeout=1)
                 yield f"data: {json.dumps(log)}\n\n"
 
                 # If import finished, send final status and end stream
-                if import_status['status'] in ['completed', 'failed', 'cancelled']:
+                if instance.import_status['status'] in ['completed', 'failed', 'cancelled']:
                     time.sleep(0.5)
-                    yield f"data: {json.dumps({'type': 'status', 'status': import_status['status']})}\n\n"
+                    yield f"data: {json.dumps({'type': 'status', 'status': instance.import_status['status']})}\n\n"
                     break
 
             except queue.Empty:
-                if import_status['status'] != 'running':
-                    yield f"data: {json.dumps({'type': 'status', 'status': import_status['status']})}\n\n"
+                if instance.import_status['status'] != 'running':
+                    yield f"data: {json.dumps({'type': 'status', 'status': instance.import_status['status']})}\n\n"
                     break
                 # Send heartbeat to keep connection alive
                 yield f": heartbeat\n\n"
@@ -704,11 +2058,692 @@ def import_stream():
     return Response(generate(), mimetype='text/event-stream')
 
 
+# Import scheduling: jobs run imports inside recurring off-peak windows, in
+# the relay's timezone (TZ in its .env). A window's run is skipped when an
+# import or restart is already in progress, and cancelled if it is still
+# going when the window closes. Every import run, scheduled or manual, is
+# recorded in the job history.
+IMPORT_SCHEDULE_FILE = CONFIG_DIR / "import_schedule.json"
+IMPORT_JOBS_FILE = CONFIG_DIR / "import_jobs.json"
+IMPORT_JOBS_LIMIT = 100
+# Seed relay subset for a run limited to fewer connections (per instance)
+IMPORT_RUN_RELAYS_FILE = "relays_import.run.json"
+IMPORT_SCHEDULER_INTERVAL = 30
+
+import_jobs_lock = threading.Lock()
+# Windows already handled, keyed "<job id>@<window start>" -> window end, and
+# the scheduled run in progress per instance
+scheduler_state = {'handled': {}, 'active': {}}
+scheduler_state_lock = threading.Lock()
+
+
+def load_import_schedule():
+    try:
+        return json.loads(IMPORT_SCHEDULE_FILE.read_text())
+    except (OSError, ValueError):
+        return []
+
+
+def load_import_jobs():
+    try:
+        return json.loads(IMPORT_JOBS_FILE.read_text())
+    except (OSError, ValueError):
+        return []
+
+
+def record_import_job(entry):
+    """Append a run to the persisted job history, keeping the newest entries."""
+    with import_jobs_lock:
+        jobs = load_import_jobs()
+        jobs.append(entry)
+        try:
+            IMPORT_JOBS_FILE.write_text(json.dumps(jobs[-IMPORT_JOBS_LIMIT:], indent=2))
+        except OSError as e:
+            print(f"Failed to record import job: {e}", flush=True)
+
+
+def parse_clock(value):
+    """'HH:MM' -> minutes after midnight (raises ValueError)."""
+    hours, minutes = (int(part) for part in str(value).split(':'))
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f'Invalid time: {value}')
+    return hours * 60 + minutes
+
+
+def parse_schedule_job(entry):
+    """Validate one schedule entry from the UI (raises ValueError)."""
+    instance = str(entry.get('instance') or DEFAULT_INSTANCE_NAME)
+    if instance not in relay_instances:
+        raise ValueError(f'Unknown relay instance: {instance}')
+    parse_clock(entry.get('start'))
+    parse_clock(entry.get('end'))
+    days = sorted({int(day) for day in entry.get('days') or []})
+    if any(day < 0 or day > 6 for day in days):
+        raise ValueError('Days are numbered 0 (Monday) to 6 (Sunday)')
+    return {
+        'id': str(entry.get('id') or os.urandom(4).hex()),
+        'instance': instance,
+        'enabled': bool(entry.get('enabled', True)),
+        'days': days,
+        'start': entry['start'],
+        'end': entry['end'],
+        **parse_import_limits(entry),
+    }
+
+
+def schedule_timezone():
+    """The relay's configured timezone (UTC if unset or unknown)."""
+    try:
+        tz_name = parse_env_text(ENV_FILE.read_text()).get('TZ')
+        return ZoneInfo(tz_name) if tz_name else timezone.utc
+    except Exception:
+        return timezone.utc
+
+
+def current_window(job, now):
+    """(start, end) of the job's window containing `now`, or None."""
+    start = parse_clock(job['start'])
+    length = (parse_clock(job['end']) - start) % 1440 or 1440
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    # A window that wraps past midnight may have opened yesterday
+    for day_offset in (0, -1):
+        window_start = midnight + timedelta(days=day_offset, minutes=start)
+        window_end = window_start + timedelta(minutes=length)
+        if window_start <= now < window_end:
+            if job['days'] and window_start.weekday() not in job['days']:
+                return None
+            return window_start, window_end
+    return None
+
+
+def next_window_start(job, now):
+    """When the job's next window opens (for display)."""
+    start = parse_clock(job['start'])
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    for day_offset in range(8):
+        window_start = midnight + timedelta(days=day_offset, minutes=start)
+        if window_start > now and (not job['days'] or window_start.weekday() in job['days']):
+            return window_start
+    return None
+
+
+def run_import_job(instance, cancel_event, limits, trigger, job):
+    """Background thread: run one import and record it in the job history."""
+    started_at = time.time()
+    run_import_process(instance, cancel_event, limits)
+    resume_config_apply(instance)
+    if IMPORT_WARM_HELPER:
+        prepare_warm_helper(instance)
+    message = instance.import_status['message']
+    if job:
+        with scheduler_state_lock:
+            active = scheduler_state['active'].pop(instance.name, None) or {}
+        if active.get('closed') and instance.import_status['status'] == 'cancelled':
+            message = 'Stopped when the import window closed'
+    record_import_job({
+        'instance': instance.name,
+        'trigger': trigger,
+        'job': job['id'] if job else None,
+        'window': job.get('window') if job else None,
+        'limits': limits,
+        'started_at': started_at,
+        'duration': round(time.time() - started_at, 1),
+        'status': instance.import_status['status'],
+        'message': message,
+    })
+
+
+def run_scheduled_imports(now):
+    """Start the imports whose window has opened; stop those whose closed."""
+    with scheduler_state_lock:
+        _run_scheduled_imports(now)
+
+
+def _run_scheduled_imports(now):
+    for name, active in list(scheduler_state['active'].items()):
+        instance = relay_instances.get(name)
+        if instance and now >= active['window_end'] and not active.get('closed'):
+            active['closed'] = True
+            request_import_cancel(instance, 'Import window closed. Stopping import...')
+
+    for job in load_import_schedule():
+        if not job.get('enabled', True):
+            continue
+        window = current_window(job, now)
+        if window is None:
+            continue
+        key = f"{job['id']}@{window[0].isoformat()}"
+        if key in scheduler_state['handled']:
+            continue
+        scheduler_state['handled'][key] = window[1]
+
+        instance = relay_instances.get(job['instance'])
+        limits = parse_import_limits(job)
+        if instance:
+            # Register the window before the import thread can finish and
+            # look for it; put back whatever was there if the start fails
+            previous = scheduler_state['active'].get(instance.name)
+            scheduler_state['active'][instance.name] = {'job': job['id'], 'window_end': window[1]}
+            error = start_import(instance, limits, 'schedule', {**job, 'window': key})
+            if error:
+                if previous:
+                    scheduler_state['active'][instance.name] = previous
+                else:
+                    del scheduler_state['active'][instance.name]
+        else:
+            error = f"Unknown relay instance: {job['instance']}"
+        if error:
+            record_import_job({
+                'instance': job['instance'],
+                'trigger': 'schedule',
+                'job': job['id'],
+                'window': key,
+                'limits': limits,
+                'started_at': time.time(),
+                'duration': 0,
+                'status': 'skipped',
+                'message': error,
+            })
+
+    # Forget windows that have closed
+    for key, window_end in list(scheduler_state['handled'].items()):
+        if window_end <= now:
+            del scheduler_state['handled'][key]
+
+
+def run_import_scheduler():
+    """Background thread: check the import schedule periodically."""
+    # Don't rerun a window that already had its run before the UI restarted
+    tz = schedule_timezone()
+    now = datetime.now(tz)
+    jobs = {job['id']: job for job in load_import_schedule()}
+    for entry in load_import_jobs():
+        job = jobs.get(entry.get('job'))
+        window = current_window(job, now) if job else None
+        if window and entry.get('window') == f"{job['id']}@{window[0].isoformat()}":
+            with scheduler_state_lock:
+                scheduler_state['handled'][entry['window']] = window[1]
+
+    while True:
+        try:
+            run_scheduled_imports(datetime.now(schedule_timezone()))
+        except Exception as e:
+            print(f"Import scheduler error: {e}", flush=True)
+        time.sleep(IMPORT_SCHEDULER_INTERVAL)
+
+
+@app.route('/api/import/schedule', methods=['GET'])
+def get_import_schedule():
+    """Get the import schedule with each job's next window"""
+    try:
+        now = datetime.now(schedule_timezone())
+        jobs = load_import_schedule()
+        for job in jobs:
+            next_start = next_window_start(job, now)
+            job['next_run'] = next_start.isoformat() if next_start else None
+            job['in_window'] = current_window(job, now) is not None
+        return jsonify({'success': True, 'jobs': jobs, 'timezone': str(now.tzinfo)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/import/schedule', methods=['POST'])
+def save_import_schedule():
+    """Replace the import schedule"""
+    data = request.get_json(silent=True) or {}
+    try:
+        jobs = [parse_schedule_job(entry) for entry in data.get('jobs', [])]
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': f'Invalid schedule: {e}'}), 400
+
+    try:
+        IMPORT_SCHEDULE_FILE.write_text(json.dumps(jobs, indent=2))
+        return jsonify({'success': True, 'jobs': jobs})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/import/jobs', methods=['GET'])
+def get_import_jobs():
+    """Get recent import runs, newest first"""
+    try:
+        return jsonify({'success': True, 'jobs': list(reversed(load_import_jobs()))})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Event export: pages through the running relay with REQ queries (newest
+# first, moving an `until` cursor back) so the relay never has to stop.
+EXPORT_DIR = Path(os.getenv('EXPORT_DIR', '/haven-config/exports'))
+# Never more than the relay's NIP-11 `limitation.max_limit`; this much is
+# assumed when a relay doesn't advertise one
+EXPORT_PAGE_SIZE = 500
+# A second holding more events than one query returns is split by kind
+# (0-65535) into ranges this wide, narrowed while a range still fills a query
+EXPORT_KIND_RANGE = 1024
+EXPORT_MAX_KIND = 65535
+# Close the compressed member and save a resume point this often
+EXPORT_CHECKPOINT_EVENTS = 10000
+EXPORT_SOCKET_TIMEOUT = 30
+EXPORT_SUBSCRIPTION_ID = 'haven-kit-export'
+EXPORT_GZIP_LEVEL = 6
+EXPORT_ZSTD_LEVEL = 3
+
+# Haven serves its relays on these paths. The private and chat relays only
+# serve reads after NIP-42 auth as the owner, and the config UI holds no key,
+# so only the outbox and inbox can be exported.
+EXPORT_RELAYS = {
+    'outbox': '/',
+    'inbox': '/inbox',
+}
+EXPORT_EXTENSIONS = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst', 'none': '.jsonl'}
+
+
+class ExportCompressor:
+    """Compresses JSONL into independent gzip members / zstd frames.
+
+    Concatenated members (frames) decode as one stream, so `finish()` can end
+    one at every checkpoint and an interrupted export resumes by truncating
+    back to the last finished member and appending.
+    """
+
+    def __init__(self, compression):
+        if compression == 'zstd' and zstandard is None:
+            raise Exception('zstd compression is not available (zstandard is not installed)')
+        if compression not in EXPORT_EXTENSIONS:
+            raise Exception(f'Unsupported compression: {compression}')
+        self.compression = compression
+        self._compressor = self._new()
+
+    def _new(self):
+        if self.compression == 'gzip':
+            return zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31)
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=EXPORT_ZSTD_LEVEL).compressobj()
+        return None
+
+    def compress(self, data):
+        return self._compressor.compress(data) if self._compressor else data
+
+    def finish(self):
+        if not self._compressor:
+            return b''
+        data = self._compressor.flush()
+        self._compressor = self._new()
+        return data
+
+
+def encode_events(events):
+    return b''.join(json.dumps(event, separators=(',', ':')).encode() + b'\n' for event in events)
+
+
+def fetch_event_page(ws, event_filter):
+    """Run one REQ to EOSE and return its events."""
+    ws.send(json.dumps(['REQ', EXPORT_SUBSCRIPTION_ID, event_filter]))
+    events = []
+    while True:
+        message = json.loads(ws.recv())
+        kind = message[0] if message else None
+        if kind == 'EVENT' and message[1] == EXPORT_SUBSCRIPTION_ID:
+            events.append(message[2])
+        elif kind == 'EOSE' and message[1] == EXPORT_SUBSCRIPTION_ID:
+            ws.send(json.dumps(['CLOSE', EXPORT_SUBSCRIPTION_ID]))
+            return events
+        elif kind == 'CLOSED' and message[1] == EXPORT_SUBSCRIPTION_ID:
+            reason = message[2] if len(message) > 2 else ''
+            raise Exception(f'Relay refused the export query: {reason}')
+        elif kind == 'NOTICE':
+            print(f"Export: relay notice: {message[1]}", flush=True)
+
+
+def relay_max_limit(relay):
+    """The relay's NIP-11 `limitation.max_limit`, or None if it has none."""
+    connection = http.client.HTTPConnection(RELAY_HOST, RELAY_PORT, timeout=EXPORT_SOCKET_TIMEOUT)
+    try:
+        connection.request('GET', EXPORT_RELAYS[relay], headers={'Accept': 'application/nostr+json'})
+        response = connection.getresponse()
+        if response.status != 200:
+            return None
+        info = json.loads(response.read())
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        print(f"Export: could not read relay information: {e}", flush=True)
+        return None
+    finally:
+        connection.close()
+    max_limit = (info.get('limitation') or {}).get('max_limit') if isinstance(info, dict) else None
+    if isinstance(max_limit, int) and not isinstance(max_limit, bool) and max_limit > 0:
+        return max_limit
+    return None
+
+
+def fetch_event_second(ws, second, limit):
+    """Every event created at `second`, for when a full page shares it.
+
+    The `until` cursor can't page within a second, so the second is queried
+    on its own and, if that fills the relay's limit too, split into kind
+    ranges. Kinds cover every event exactly once, so the ranges that come
+    back short of the limit add up to the whole second. A single kind that
+    still fills the limit can't be listed, and the export stops rather than
+    skip events.
+    """
+    event_filter = {'since': second, 'until': second, 'limit': limit}
+    page = fetch_event_page(ws, event_filter)
+    if len(page) < limit:
+        return page
+
+    events = []
+    ranges = [(start, min(start + EXPORT_KIND_RANGE, EXPORT_MAX_KIND + 1))
+              for start in range(0, EXPORT_MAX_KIND + 1, EXPORT_KIND_RANGE)]
+    while ranges:
+        start, end = ranges.pop()
+        page = fetch_event_page(ws, {**event_filter, 'kinds': list(range(start, end))})
+        if len(page) < limit:
+            events.extend(page)
+        elif end - start > 1:
+            middle = (start + end) // 2
+            ranges.extend([(start, middle), (middle, end)])
+        else:
+            raise Exception(
+                f'At least {limit} kind {start} events were created at {second}, as many as the '
+                'relay returns for one query; the export stops rather than skip events'
+            )
+    return events
+
+
+def iter_relay_event_pages(relay, since=None, until=None, cursor=None, boundary=()):
+    """Yield (events, resume_state) for every page of the relay's events.
+
+    Pages run newest to oldest. The cursor is the oldest `created_at` seen so
+    far and is queried inclusively, so `boundary` holds the ids already
+    exported at exactly that second to keep them from being written twice.
+    Passing a saved resume_state's cursor and boundary continues an export.
+    """
+    url = f"ws://{RELAY_HOST}:{RELAY_PORT}{EXPORT_RELAYS[relay]}"
+    max_limit = relay_max_limit(relay) or EXPORT_PAGE_SIZE
+    page_size = min(EXPORT_PAGE_SIZE, max_limit)
+    if cursor is None:
+        cursor = until if until is not None else int(time.time())
+    boundary = set(boundary)
+
+    # Frames are decoded as JSON right away, which rejects bad UTF-8 anyway;
+    # websocket-client's own pure-Python validation would dominate the export.
+    ws = websocket.create_connection(url, timeout=EXPORT_SOCKET_TIMEOUT, skip_utf8_validation=True)
+    try:
+        while since is None or cursor >= since:
+            event_filter = {'until': cursor, 'limit': page_size}
+            if since is not None:
+                event_filter['since'] = since
+            page = fetch_event_page(ws, event_filter)
+            if not page:
+                return
+
+            fresh = [event for event in page if event.get('id') not in boundary]
+            oldest = min(event.get('created_at', cursor) for event in page)
+            if oldest < cursor:
+                cursor = oldest
+                boundary = {event.get('id') for event in page if event.get('created_at') == oldest}
+            elif fresh:
+                boundary.update(event.get('id') for event in fresh)
+            else:
+                # Everything this page held at the cursor's second has been
+                # seen. A full page may have left more there: fetch the whole
+                # second before stepping past it.
+                if len(page) >= page_size:
+                    fresh = [event for event in fetch_event_second(ws, cursor, max_limit)
+                             if event.get('id') not in boundary]
+                cursor -= 1
+                boundary = set()
+
+            yield fresh, {'cursor': cursor, 'boundary': sorted(boundary)}
+    finally:
+        ws.close()
+
+
+def parse_export_params(data):
+    """Validate export options from a request; returns (params, error)."""
+    relay = data.get('relay') or 'outbox'
+    compression = data.get('compression') or 'gzip'
+    if relay not in EXPORT_RELAYS:
+        return None, f'Unknown relay: {relay}'
+    if compression not in EXPORT_EXTENSIONS:
+        return None, f'Unsupported compression: {compression}'
+    if compression == 'zstd' and zstandard is None:
+        return None, 'zstd compression is not available'
+    try:
+        since = int(data['since']) if data.get('since') not in (None, '') else None
+        until = int(data['until']) if data.get('until') not in (None, '') else None
+    except (TypeError, ValueError):
+        return None, 'since and until must be Unix timestamps'
+    return {'relay': relay, 'compression': compression, 'since': since, 'until': until}, None
+
+
+# Export state management
+export_status = {'status': 'idle', 'message': '', 'file': None, 'events': 0}
+export_state_lock = threading.Lock()
+export_control = {
+    'thread': None,
+    'cancel_event': None,
+}
+
+
+def export_state_path(name):
+    return EXPORT_DIR / f"{name}.state.json"
+
+
+def save_export_state(name, state):
+    tmp_path = EXPORT_DIR / f"{name}.state.json.tmp"
+    tmp_path.write_text(json.dumps(state, indent=2))
+    os.replace(tmp_path, export_state_path(name))
+
+
+def run_export_process(name, state, cancel_event):
+    """Background thread to export relay events into EXPORT_DIR/name.
+
+    Progress is checkpointed every EXPORT_CHECKPOINT_EVENTS events (and when
+    stopping for any reason): the open compressed member is finished, the file
+    synced and the cursor saved alongside the output size, so a resumed export
+    truncates any partial tail and carries on from the same page.
+    """
+    global export_status
+
+    output_path = EXPORT_DIR / name
+    export_status = {'status': 'running', 'message': 'Exporting events...', 'file': name, 'events': state['events']}
+
+    try:
+        with open(output_path, 'ab') as output:
+            if output.seek(0, os.SEEK_END) < state['size']:
+                raise Exception(f'{name} is shorter than its last checkpoint; start a new export')
+            # Truncating leaves the position at the old end; tell() must
+            # report the checkpointed size even if nothing is written
+            output.truncate(state['size'])
+            output.seek(state['size'])
+            compressor = ExportCompressor(state['compression'])
+            resume_state = {'cursor': state['cursor'], 'boundary': state['boundary']}
+            unsaved = 0
+
+            def checkpoint():
+                output.write(compressor.finish())
+                output.flush()
+                os.fsync(output.fileno())
+                state.update(resume_state, size=output.tell())
+                save_export_state(name, state)
+
+            try:
+                pages = iter_relay_event_pages(
+                    state['relay'], state['since'], state['until'],
+                    state['cursor'], state['boundary']
+                )
+                for events, resume_state in pages:
+                    if events:
+                        output.write(compressor.compress(encode_events(events)))
+                    unsaved += len(events)
+                    state['events'] += len(events)
+                    export_status['events'] = state['events']
+                    export_status['message'] = f"Exported {state['events']} events"
+
+                    if unsaved >= EXPORT_CHECKPOINT_EVENTS:
+                        checkpoint()
+                        unsaved = 0
+
+                    if cancel_event.is_set():
+                        break
+            finally:
+                checkpoint()
+
+        if cancel_event.is_set():
+            export_status = {'status': 'cancelled', 'message': f"Export paused after {state['events']} events",
+                             'file': name, 'events': state['events']}
+        else:
+            export_state_path(name).unlink(missing_ok=True)
+            export_status = {'status': 'completed', 'message': f"Exported {state['events']} events",
+                             'file': name, 'events': state['events']}
+
+    except Exception as e:
+        print(f"Export failed: {e}", flush=True)
+        export_status = {'status': 'failed', 'message': str(e), 'file': name, 'events': state['events']}
+
+    finally:
+        with export_state_lock:
+            export_control['thread'] = None
+            export_control['cancel_event'] = None
+
+
+@app.route('/api/export/run', methods=['POST'])
+def run_export():
+    """Start a new export to a file, or resume an interrupted one"""
+    data = request.get_json(silent=True) or {}
+
+    with export_state_lock:
+        if export_control['thread'] is not None:
+            return jsonify({'success': False, 'error': 'An export is already running'}), 400
+
+        try:
+            EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+            resume = data.get('resume')
+            if resume:
+                name = Path(resume).name
+                try:
+                    state = json.loads(export_state_path(name).read_text())
+                except (OSError, ValueError):
+                    return jsonify({'success': False, 'error': f'No resumable export named {name}'}), 400
+            else:
+                params, error = parse_export_params(data)
+                if error:
+                    return jsonify({'success': False, 'error': error}), 400
+                stamp = time.strftime('%Y%m%d-%H%M%S', time.gmtime())
+                name = f"events-{params['relay']}-{stamp}{EXPORT_EXTENSIONS[params['compression']]}"
+                state = {**params, 'cursor': None, 'boundary': [], 'events': 0, 'size': 0}
+                save_export_state(name, state)
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+        cancel_event = threading.Event()
+        thread = threading.Thread(target=run_export_process, args=(name, state, cancel_event), daemon=True)
+        export_control['thread'] = thread
+        export_control['cancel_event'] = cancel_event
+        thread.start()
+
+    return jsonify({'success': True, 'message': 'Export started', 'file': name})
+
+
+@app.route('/api/export/cancel', methods=['POST'])
+def cancel_export():
+    """Stop the running export at the next page; it can be resumed later"""
+    with export_state_lock:
+        cancel_event = export_control.get('cancel_event')
+
+    if cancel_event is None:
+        return jsonify({'success': False, 'error': 'No export is currently running'}), 400
+
+    cancel_event.set()
+    return jsonify({'success': True, 'message': 'Export cancellation requested'})
+
+
+@app.route('/api/export/status', methods=['GET'])
+def get_export_status():
+    """Get export progress and the export files available for download"""
+    try:
+        files = []
+        if EXPORT_DIR.exists():
+            for path in sorted(EXPORT_DIR.glob('events-*'), reverse=True):
+                if path.name.endswith('.state.json') or path.name.endswith('.tmp'):
+                    continue
+                files.append({
+                    'name': path.name,
+                    'size': path.stat().st_size,
+                    'resumable': export_state_path(path.name).exists(),
+                })
+        return jsonify({
+            'success': True,
+            **export_status,
+            'relays': list(EXPORT_RELAYS),
+            'compressions': [c for c in EXPORT_EXTENSIONS if c != 'zstd' or zstandard is not None],
+            'files': files,
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/export/download/<path:name>', methods=['GET'])
+def download_export(name):
+    """Download a finished (or partial) export file"""
+    return send_from_directory(EXPORT_DIR, Path(name).name, as_attachment=True)
+
+
+@app.route('/api/export/stream', methods=['GET'])
+def stream_export():
+    """Stream events straight from the relay as a compressed JSONL download
+
+    Nothing is written to disk. To continue an interrupted download, pass
+    `until` as the oldest created_at already received and `boundary` as the
+    comma-separated ids of the events received with exactly that created_at;
+    that second is queried again and only its other events are sent.
+    """
+    params, error = parse_export_params(request.args)
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+    boundary = [event_id for event_id in request.args.get('boundary', '').split(',') if event_id]
+    if boundary and params['until'] is None:
+        return jsonify({'success': False, 'error': 'boundary needs the until it was received at'}), 400
+
+    def generate():
+        compressor = ExportCompressor(params['compression'])
+        try:
+            pages = iter_relay_event_pages(
+                params['relay'], params['since'], params['until'], boundary=boundary
+            )
+            for events, _ in pages:
+                if events:
+                    chunk = compressor.compress(encode_events(events))
+                    if chunk:
+                        yield chunk
+        except Exception as e:
+            # Don't finish the compressed stream: ending the response without
+            # a trailer leaves a truncated download instead of an archive
+            # that looks complete
+            print(f"Export stream failed: {e}", flush=True)
+            raise
+        yield compressor.finish()
+
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.gmtime())
+    filename = f"events-{params['relay']}-{stamp}{EXPORT_EXTENSIONS[params['compression']]}"
+    return Response(
+        generate(),
+        mimetype='application/octet-stream',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
 @app.route('/api/logs/stream', methods=['GET'])
-def stream_logs():
+@app.route('/api/instances/<instance_name>/logs/stream', methods=['GET'])
+def stream_logs(instance_name=None):
     """Stream logs from the haven_relay container in real-time via SSE"""
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
+
     def generate():
-        container_name = get_relay_container_name()
+        container_name = instance.container_name
         process = None
 
         try:
@@ -823,10 +2858,14 @@ def get_tor_info():
 
 
 @app.route('/api/logs', methods=['GET'])
-def get_logs():
+@app.route('/api/instances/<instance_name>/logs', methods=['GET'])
+def get_logs(instance_name=None):
     """Fetch logs from the haven_relay container (for download)"""
+    instance, error_response = lookup_instance(instance_name)
+    if error_response:
+        return error_response
     try:
-        container_name = get_relay_container_name()
+        container_name = instance.container_name
 
         # Get logs from container (all logs, no tail limit)
         result = subprocess.run(
@@ -864,11 +2903,291 @@ def get_logs():
         }), 500
 
 
+# On-demand profiling. Nothing is hooked in while no session is running:
+# sampling reads other threads' stacks from a sampler thread, and cProfile
+# swaps the chosen view function for a wrapper only for the session's window.
+# The endpoints are disabled unless PROFILING_TOKEN is set, and every call
+# must send it in the X-Profiling-Token header.
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '').strip()
+PROFILES_DIR = CONFIG_DIR / "profiles"
+PROFILING_MAX_SECONDS = 600
+PROFILING_DEFAULT_SECONDS = 60
+PROFILING_DEFAULT_INTERVAL = 0.01
+# Requests profiled by one cProfile session (each gets its own Profile)
+PROFILING_MAX_REQUESTS = 1000
+
+profiling_state_lock = threading.Lock()
+profiling_control = {'session': None}
+
+
+def _code_objects(func):
+    """The function's code plus nested code (e.g. an SSE route's generate())."""
+    code = func.__code__
+    return {code} | {const for const in code.co_consts if isinstance(const, types.CodeType)}
+
+
+def profiling_targets():
+    """Map target names to the code objects whose threads they profile."""
+    targets = {
+        'import': {run_import_process.__code__},
+        'export': {run_export_process.__code__},
+        'logs': _code_objects(stream_logs),
+    }
+    for endpoint, view in app.view_functions.items():
+        if endpoint == 'static' or endpoint.startswith('profiling'):
+            continue
+        targets[f'route:{endpoint}'] = _code_objects(view)
+    return targets
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def run_sampling_profiler(session, codes):
+    """Sample the stacks of threads running `codes` until the session ends.
+
+    Stacks are written in collapsed ("folded") format, one `a;b;c count` line
+    per distinct stack, which flamegraph.pl and speedscope read directly.
+    """
+    counts = Counter()
+    me = threading.get_ident()
+    while not session['stop_event'].wait(session['interval']):
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            stack = []
+            hit = False
+            while frame is not None:
+                hit = hit or frame.f_code in codes
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if hit:
+                counts[';'.join(reversed(stack))] += 1
+
+    with open(PROFILES_DIR / session['file'], 'w') as output:
+        for stack, count in counts.most_common():
+            output.write(f"{stack} {count}\n")
+    session['samples'] = sum(counts.values())
+
+
+def _profiled_view(view, profiles):
+    """Wrap a view so each request (including a streamed body) gets a Profile."""
+    def wrapper(*args, **kwargs):
+        profile = cProfile.Profile()
+        response = profile.runcall(view, *args, **kwargs)
+        if len(profiles) < PROFILING_MAX_REQUESTS:
+            profiles.append(profile)
+
+        if isinstance(response, Response) and response.is_streamed:
+            body = response.response
+
+            def profiled_body():
+                iterator = iter(body)
+                while True:
+                    profile.enable()
+                    try:
+                        chunk = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        profile.disable()
+                    yield chunk
+            response.response = profiled_body()
+        return response
+
+    wrapper.__name__ = view.__name__
+    return wrapper
+
+
+def run_cprofile_session(session, endpoint):
+    """Swap in a profiling wrapper for `endpoint` until the session ends."""
+    original = app.view_functions[endpoint]
+    profiles = []
+    app.view_functions[endpoint] = _profiled_view(original, profiles)
+    try:
+        session['stop_event'].wait(session['duration'])
+    finally:
+        app.view_functions[endpoint] = original
+
+    session['samples'] = len(profiles)
+    if profiles:
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(str(PROFILES_DIR / session['file']))
+
+
+def run_profiling_session(session, codes):
+    try:
+        if session['mode'] == 'sampling':
+            # The sampler stops itself once the window has passed
+            timer = threading.Timer(session['duration'], session['stop_event'].set)
+            timer.daemon = True
+            timer.start()
+            run_sampling_profiler(session, codes)
+        else:
+            run_cprofile_session(session, session['target'].split(':', 1)[1])
+        session['status'] = 'completed'
+    except Exception as e:
+        print(f"Profiling session failed: {e}", flush=True)
+        session['status'] = 'failed'
+        session['error'] = str(e)
+    finally:
+        session['stop_event'].set()
+
+
+def profiling_denied():
+    """Return an error response unless the request carries the profiling token."""
+    if not PROFILING_TOKEN:
+        return jsonify({'success': False, 'error': 'Profiling is disabled; set PROFILING_TOKEN to enable it'}), 403
+    token = request.headers.get('X-Profiling-Token', '')
+    if not hmac.compare_digest(token.encode(), PROFILING_TOKEN.encode()):
+        return jsonify({'success': False, 'error': 'Invalid profiling token'}), 403
+    return None
+
+
+def _session_info(session):
+    if session is None:
+        return None
+    return {key: value for key, value in session.items() if key not in ('stop_event', 'thread')}
+
+
+@app.route('/api/profiling', methods=['GET'], endpoint='profiling_status')
+def get_profiling_status():
+    """Get the current profiling session, available targets and saved profiles"""
+    denied = profiling_denied()
+    if denied:
+        return denied
+    try:
+        files = []
+        if PROFILES_DIR.exists():
+            files = [
+                {'name': path.name, 'size': path.stat().st_size}
+                for path in sorted(PROFILES_DIR.iterdir(), reverse=True)
+            ]
+        return jsonify({
+            'success': True,
+            'session': _session_info(profiling_control['session']),
+            'targets': sorted(profiling_targets()),
+            'files': files,
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/profiling/start', methods=['POST'], endpoint='profiling_start')
+def start_profiling():
+    """Profile a route or worker thread for a bounded time window"""
+    denied = profiling_denied()
+    if denied:
+        return denied
+
+    data = request.get_json(silent=True) or {}
+    target = data.get('target', '')
+    mode = data.get('mode', 'sampling')
+    targets = profiling_targets()
+
+    if target not in targets:
+        return jsonify({'success': False, 'error': f'Unknown profiling target: {target}'}), 400
+    if mode not in ('sampling', 'cprofile'):
+        return jsonify({'success': False, 'error': f'Unknown profiling mode: {mode}'}), 400
+    if mode == 'cprofile' and not target.startswith('route:'):
+        return jsonify({'success': False, 'error': 'cprofile mode profiles routes; use sampling for worker threads'}), 400
+    try:
+        duration = min(float(data.get('duration', PROFILING_DEFAULT_SECONDS)), PROFILING_MAX_SECONDS)
+        interval = max(float(data.get('interval', PROFILING_DEFAULT_INTERVAL)), 0.001)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'duration and interval must be numbers'}), 400
+    if duration <= 0:
+        return jsonify({'success': False, 'error': 'duration must be positive'}), 400
+
+    with profiling_state_lock:
+        current = profiling_control['session']
+        if current and current['status'] == 'running':
+            return jsonify({'success': False, 'error': 'A profiling session is already running'}), 400
+
+        try:
+            PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.gmtime())
+        extension = 'folded' if mode == 'sampling' else 'prof'
+        session = {
+            'target': target,
+            'mode': mode,
+            'status': 'running',
+            'duration': duration,
+            'interval': interval,
+            'started_at': time.time(),
+            'file': f"{target.replace(':', '-')}-{stamp}.{extension}",
+            'samples': 0,
+            'stop_event': threading.Event(),
+        }
+        session['thread'] = threading.Thread(
+            target=run_profiling_session, args=(session, targets[target]), daemon=True
+        )
+        profiling_control['session'] = session
+        session['thread'].start()
+
+    return jsonify({'success': True, 'message': f'Profiling {target} for {duration:g}s', 'session': _session_info(session)})
+
+
+@app.route('/api/profiling/stop', methods=['POST'], endpoint='profiling_stop')
+def stop_profiling():
+    """End the running profiling session early and save what it collected"""
+    denied = profiling_denied()
+    if denied:
+        return denied
+
+    session = profiling_control['session']
+    if not session or session['status'] != 'running':
+        return jsonify({'success': False, 'error': 'No profiling session is running'}), 400
+
+    session['stop_event'].set()
+    session['thread'].join(timeout=10)
+    return jsonify({'success': True, 'session': _session_info(session)})
+
+
+@app.route('/api/profiling/download/<path:name>', methods=['GET'], endpoint='profiling_download')
+def download_profile(name):
+    """Download a saved profile"""
+    denied = profiling_denied()
+    if denied:
+        return denied
+    return send_from_directory(PROFILES_DIR, Path(name).name, as_attachment=True)
+
+
 # Ensure config files exist when the module is loaded (with error handling)
 try:
     ensure_config_files()
 except Exception as e:
     print(f"Warning: Failed to ensure config files: {e}", flush=True)
 
+# Register the extra relay instances listed in instances.json
+load_instances()
+
+# With no record of what a relay was started with, assume the config on
+# disk (it is what the relay read when it last started)
+for instance in list(relay_instances.values()):
+    try:
+        if load_applied_fingerprint(instance) is None:
+            mark_config_applied(config_fingerprint(instance), instance)
+    except Exception as e:
+        print(f"Warning: Failed to record applied config for {instance.name}: {e}", flush=True)
+
+# Follow the relay's resource usage for as long as the UI is up
+stats_collectors['relay'].start()
+
+threading.Thread(target=run_import_scheduler, daemon=True).start()
+
+# Keep the import helper's runtime details fresh from engine events, and its
+# container ready ahead of time when enabled
+engine_events.start()
+if IMPORT_WARM_HELPER:
+    for instance in list(relay_instances.values()):
+        threading.Thread(target=prepare_warm_helper, args=(instance,), daemon=True).start()
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8080, debug=False)
@@ -730,7 +730,7 @@ async function saveConfiguration() {
         const data = await response.json();
 
         if (data.success) {
-            showNotification('✓ Configuration saved successfully', 'success');
+            applyConfig('✓ Configuration saved');
             // Update the advanced editor too
             document.getElementById('env-editor').value = envContent;
             // Reload form to ensure all fields are in sync
@@ -792,6 +792,8 @@ function initTabs() {
             // Load import info when Import Notes tab is clicked
             if (tabName === 'import-notes') {
                 loadImportInfo();
+                loadImportSchedule();
+                loadExportInfo();
             }
         });
     });
@@ -1159,7 +1161,7 @@ async function saveEnvConfigAdvanced() {
         const data = await response.json();
 
         if (data.success) {
-            showNotification('✓ Configuration saved successfully', 'success');
+            applyConfig('✓ Configuration saved');
             // Reload form to ensure all fields are in sync
             loadConfigIntoForm();
             // Update relay URL display on Get Started page
@@ -1394,7 +1396,12 @@ async function saveRelayConfig(type) {
 
         if (data.success) {
             const typeName = type.charAt(0).toUpperCase() + type.slice(1);
-            showNotification(`✓ ${typeName} configuration saved successfully`, 'success');
+            if (type === 'import') {
+                // Only read by imports, so there is nothing to restart for
+                showNotification(`✓ ${typeName} configuration saved`, 'success');
+            } else {
+                applyConfig(`✓ ${typeName} configuration saved`);
+            }
         } else {
             showNotification('Failed to save: ' + data.error, 'error');
         }
@@ -1408,6 +1415,12 @@ async function saveRelayConfig(type) {
 }
 
 // Restart functionality
+const RESTART_PHASE_LABELS = {
+    stop: 'Stopping...',
+    start: 'Starting...',
+    ready: 'Waiting for relay...'
+};
+
 async function restartHaven() {
     if (!confirm('Are you sure you want to restart HAVEN?\n\nThis will briefly interrupt the relay service.')) {
         return;
@@ -1429,8 +1442,7 @@ async function restartHaven() {
         const data = await response.json();
 
         if (data.success) {
-            showNotification('✓ HAVEN relay restarted successfully', 'success');
-            setTimeout(checkStatus, 3000);
+            await followRestartProgress(btn);
         } else {
             showNotification('Failed to restart: ' + data.error, 'error');
         }
@@ -1443,6 +1455,76 @@ async function restartHaven() {
     }
 }
 
+// Config apply: the server restarts the relay once a burst of saves settles,
+// and only if the saved config differs from what the relay is running with
+let applyFollowTimer = null;
+
+async function applyConfig(savedMessage) {
+    try {
+        const response = await fetch('/api/config/apply', {
+            method: 'POST'
+        });
+
+        const data = await response.json();
+
+        if (!data.success) {
+            showNotification(`${savedMessage}, but applying it failed: ${data.error}`, 'error');
+            return;
+        }
+
+        showNotification(`${savedMessage}. ${data.message}`, 'success');
+
+        // A later save re-arms the server's timer, so only follow the latest one
+        if (applyFollowTimer) {
+            clearTimeout(applyFollowTimer);
+            applyFollowTimer = null;
+        }
+        if (data.restart) {
+            applyFollowTimer = setTimeout(() => {
+                applyFollowTimer = null;
+                followRestartProgress(null);
+            }, data.delay * 1000 + 500);
+        }
+    } catch (error) {
+        showNotification(`${savedMessage}, but applying it failed`, 'error');
+        console.error(error);
+    }
+}
+
+// Follow a running restart over SSE until the relay accepts connections again
+function followRestartProgress(btn) {
+    return new Promise(resolve => {
+        const source = new EventSource('/api/restart/stream');
+
+        const finish = () => {
+            source.close();
+            checkStatus();
+            resolve();
+        };
+
+        source.onmessage = function(event) {
+            const data = JSON.parse(event.data);
+
+            if (data.type === 'phase') {
+                if (btn) {
+                    btn.innerHTML = `<span class="loading"></span> ${RESTART_PHASE_LABELS[data.phase] || 'Restarting...'}`;
+                }
+                checkStatus();
+            } else if (data.type === 'success') {
+                showNotification('✓ ' + data.message, 'success');
+            } else if (data.type === 'error') {
+                showNotification(data.message, 'error');
+            } else if (data.type === 'status' && data.status !== 'running') {
+                finish();
+            }
+        };
+
+        source.onerror = function() {
+            finish();
+        };
+    });
+}
+
 // Notification system
 function showNotification(message, type = 'info') {
     const notification = document.getElementById('notification');
@@ -1592,10 +1674,14 @@ function runImport() {
     logOutput.innerHTML = '';
     logContainer.style.display = 'flex';
 
-    // Start import
+    // Start import, with the optional per-run limits
     fetch('/api/import/run', {
         method: 'POST',
-        headers: {'Content-Type': 'application/json'}
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            max_relays: document.getElementById('import-max-relays').value,
+            cpus: document.getElementById('import-cpus').value
+        })
     })
     .then(response => response.json())
     .then(data => {
@@ -1978,3 +2064,615 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     });
 });
+
+// ==================== Export Notes ====================
+
+let exportPollTimer = null;
+
+async function loadExportInfo() {
+    try {
+        const response = await fetch('/api/export/status');
+        const data = await response.json();
+
+        if (!data.success) {
+            document.getElementById('export-status-text').textContent = data.error;
+            return;
+        }
+
+        const running = data.status === 'running';
+        const runButton = document.getElementById('run-export-btn');
+        const cancelButton = document.getElementById('cancel-export-btn');
+        runButton.disabled = running;
+        runButton.innerHTML = running ? '<span class="loading"></span> Exporting...' : 'Export Notes';
+        cancelButton.style.display = running ? 'inline-flex' : 'none';
+
+        // Hide compression formats the server can't produce
+        document.querySelectorAll('#export-compression option').forEach(option => {
+            option.disabled = !data.compressions.includes(option.value);
+        });
+
+        const statusText = document.getElementById('export-status-text');
+        statusText.textContent = data.status === 'idle' ? '' : `${data.file}: ${data.message}`;
+
+        renderExportFiles(data.files, running);
+
+        if (running && !exportPollTimer) {
+            exportPollTimer = setInterval(loadExportInfo, 2000);
+        } else if (!running && exportPollTimer) {
+            clearInterval(exportPollTimer);
+            exportPollTimer = null;
+        }
+    } catch (error) {
+        console.error('Failed to load export info:', error);
+    }
+}
+
+function renderExportFiles(files, running) {
+    const list = document.getElementById('export-files');
+    list.innerHTML = '';
+
+    files.forEach(file => {
+        const item = document.createElement('div');
+        item.className = 'relay-item';
+
+        const label = document.createElement('span');
+        label.className = 'export-file-name';
+        label.textContent = `${file.name} (${formatBytes(file.size)})${file.resumable ? ' - incomplete' : ''}`;
+        item.appendChild(label);
+
+        if (file.resumable) {
+            const resume = document.createElement('button');
+            resume.className = 'btn btn-secondary btn-sm';
+            resume.textContent = 'Resume';
+            resume.disabled = running;
+            resume.onclick = () => runExport(file.name);
+            item.appendChild(resume);
+        } else {
+            const link = document.createElement('a');
+            link.className = 'btn btn-secondary btn-sm';
+            link.textContent = 'Download';
+            link.href = `/api/export/download/${encodeURIComponent(file.name)}`;
+            item.appendChild(link);
+        }
+
+        list.appendChild(item);
+    });
+}
+
+async function runExport(resumeName) {
+    const body = resumeName ? { resume: resumeName } : {
+        relay: document.getElementById('export-relay').value,
+        compression: document.getElementById('export-compression').value
+    };
+
+    try {
+        const response = await fetch('/api/export/run', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(body)
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            showNotification(resumeName ? 'Export resumed' : 'Export started', 'info');
+        } else {
+            showNotification('Failed to start export: ' + data.error, 'error');
+        }
+    } catch (error) {
+        showNotification('Error starting export', 'error');
+        console.error(error);
+    }
+
+    loadExportInfo();
+}
+
+async function cancelExport() {
+    try {
+        const response = await fetch('/api/export/cancel', {
+            method: 'POST'
+        });
+
+        const data = await response.json();
+
+        if (!data.success) {
+            showNotification('Failed to pause export: ' + data.error, 'error');
+        }
+    } catch (error) {
+        showNotification('Error pausing export', 'error');
+        console.error(error);
+    }
+
+    loadExportInfo();
+}
+
+// ==================== Resource Usage ====================
+
+let statsPollTimer = null;
+
+const STATS_COLORS = {
+    relay: '#A78BFA',
+    import: '#F59E0B'
+};
+
+// Format a byte count (or byte rate) for display
+function formatBytes(value) {
+    const units = ['B', 'KB', 'MB', 'GB', 'TB'];
+    let size = value || 0;
+    let unit = 0;
+    while (size >= 1024 && unit < units.length - 1) {
+        size /= 1024;
+        unit++;
+    }
+    return `${size.toFixed(size >= 100 || unit === 0 ? 0 : 1)} ${units[unit]}`;
+}
+
+// Draw one or more series onto a canvas; each series is {color, time, values}
+function drawStatsChart(canvasId, series, formatValue) {
+    const canvas = document.getElementById(canvasId);
+    if (!canvas) {
+        return;
+    }
+
+    // Match the backing store to the rendered size so lines stay crisp
+    const ratio = window.devicePixelRatio || 1;
+    const width = canvas.clientWidth;
+    const height = canvas.clientHeight;
+    canvas.width = width * ratio;
+    canvas.height = height * ratio;
+    const ctx = canvas.getContext('2d');
+    ctx.scale(ratio, ratio);
+    ctx.clearRect(0, 0, width, height);
+
+    const allTimes = series.flatMap(s => s.time);
+    if (allTimes.length < 2) {
+        ctx.fillStyle = '#94A3B8';
+        ctx.font = '13px sans-serif';
+        ctx.fillText('Collecting data...', 8, height / 2);
+        return;
+    }
+
+    const minTime = Math.min(...allTimes);
+    const maxTime = Math.max(...allTimes);
+    const maxValue = Math.max(1, ...series.flatMap(s => s.values));
+    const top = 16;
+    const plotHeight = height - top - 4;
+
+    // Grid line and label at the top of the scale
+    ctx.strokeStyle = '#334155';
+    ctx.beginPath();
+    ctx.moveTo(0, top);
+    ctx.lineTo(width, top);
+    ctx.stroke();
+    ctx.fillStyle = '#94A3B8';
+    ctx.font = '11px sans-serif';
+    ctx.fillText(formatValue(maxValue), 4, top - 4);
+
+    series.forEach(s => {
+        if (s.time.length === 0) {
+            return;
+        }
+        ctx.strokeStyle = s.color;
+        ctx.lineWidth = 1.5;
+        ctx.beginPath();
+        s.time.forEach((t, i) => {
+            const x = ((t - minTime) / Math.max(maxTime - minTime, 1)) * width;
+            const y = top + plotHeight - (s.values[i] / maxValue) * plotHeight;
+            if (i === 0) {
+                ctx.moveTo(x, y);
+            } else {
+                ctx.lineTo(x, y);
+            }
+        });
+        ctx.stroke();
+    });
+}
+
+async function loadStats() {
+    const resolution = document.getElementById('stats-resolution').value;
+
+    try {
+        const response = await fetch(`/api/stats?resolution=${resolution}`);
+        const data = await response.json();
+
+        if (!data.success) {
+            document.getElementById('stats-summary').textContent = data.error || 'Statistics unavailable';
+            return;
+        }
+
+        // Only chart the import helper when it has recorded something
+        const names = ['relay', 'import'].filter(name =>
+            data.containers[name] && (name === 'relay' || data.containers[name].time.length > 0));
+        const seriesFor = (field, transform = v => v) => names.map(name => ({
+            color: STATS_COLORS[name],
+            time: data.containers[name].time,
+            values: data.containers[name][field].map(transform)
+        }));
+        const sumSeries = (a, b) => names.map(name => ({
+            color: STATS_COLORS[name],
+            time: data.containers[name].time,
+            values: data.containers[name][a].map((v, i) => v + data.containers[name][b][i])
+        }));
+
+        drawStatsChart('stats-chart-cpu', seriesFor('cpu'), v => `${v.toFixed(0)}%`);
+        drawStatsChart('stats-chart-mem', seriesFor('mem'), formatBytes);
+        drawStatsChart('stats-chart-block', sumSeries('block_read', 'block_write'), v => `${formatBytes(v)}/s`);
+        drawStatsChart('stats-chart-net', sumSeries('net_rx', 'net_tx'), v => `${formatBytes(v)}/s`);
+
+        const latest = data.containers.relay.latest;
+        if (latest) {
+            document.getElementById('stats-current-cpu').textContent = `${latest.cpu.toFixed(1)}%`;
+            document.getElementById('stats-current-mem').textContent =
+                `${formatBytes(latest.mem)} / ${formatBytes(latest.mem_limit)}`;
+            document.getElementById('stats-current-block').textContent =
+                `↓ ${formatBytes(latest.block_read)}/s ↑ ${formatBytes(latest.block_write)}/s`;
+            document.getElementById('stats-current-net').textContent =
+                `↓ ${formatBytes(latest.net_rx)}/s ↑ ${formatBytes(latest.net_tx)}/s`;
+        }
+
+        const summary = document.getElementById('stats-summary');
+        summary.innerHTML = names.map(name =>
+            `<span class="stats-legend-${name}">■</span> ${data.containers[name].name}`).join(' &nbsp; ');
+    } catch (error) {
+        console.error('Failed to load resource statistics:', error);
+    }
+}
+
+function startStatsPolling() {
+    stopStatsPolling();
+    loadStats();
+    statsPollTimer = setInterval(loadStats, 5000);
+}
+
+function stopStatsPolling() {
+    if (statsPollTimer) {
+        clearInterval(statsPollTimer);
+        statsPollTimer = null;
+    }
+}
+
+// Only poll for statistics while the Resources tab is visible
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('.tab-button').forEach(button => {
+        button.addEventListener('click', () => {
+            if (button.dataset.tab === 'resources') {
+                startStatsPolling();
+            } else {
+                stopStatsPolling();
+            }
+        });
+    });
+});
+
+// ==================== Import Schedule ====================
+
+const SCHEDULE_DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'];
+let importSchedule = [];
+
+async function loadImportSchedule() {
+    try {
+        const [scheduleResponse, jobsResponse] = await Promise.all([
+            fetch('/api/import/schedule'),
+            fetch('/api/import/jobs')
+        ]);
+        const schedule = await scheduleResponse.json();
+        const jobs = await jobsResponse.json();
+
+        if (schedule.success) {
+            importSchedule = schedule.jobs;
+            renderImportSchedule();
+        }
+        if (jobs.success) {
+            renderImportJobs(jobs.jobs.slice(0, 10));
+        }
+    } catch (error) {
+        console.error('Failed to load import schedule:', error);
+    }
+}
+
+function renderImportSchedule() {
+    const list = document.getElementById('import-schedule-list');
+    list.innerHTML = '';
+
+    if (importSchedule.length === 0) {
+        list.innerHTML = '<p class="help-text">No import windows scheduled.</p>';
+        return;
+    }
+
+    importSchedule.forEach((job, index) => {
+        const item = document.createElement('div');
+        item.className = 'relay-item schedule-job';
+
+        const enabled = document.createElement('input');
+        enabled.type = 'checkbox';
+        enabled.checked = job.enabled !== false;
+        enabled.title = 'Enabled';
+        enabled.onchange = () => { job.enabled = enabled.checked; };
+        item.appendChild(enabled);
+
+        ['start', 'end'].forEach(field => {
+            const input = document.createElement('input');
+            input.type = 'time';
+            input.className = 'form-input';
+            input.value = job[field] || '';
+            input.onchange = () => { job[field] = input.value; };
+            item.appendChild(input);
+        });
+
+        const days = document.createElement('span');
+        days.className = 'schedule-days';
+        SCHEDULE_DAYS.forEach((label, day) => {
+            const dayLabel = document.createElement('label');
+            const checkbox = document.createElement('input');
+            checkbox.type = 'checkbox';
+            checkbox.checked = (job.days || []).includes(day);
+            checkbox.onchange = () => {
+                const selected = new Set(job.days || []);
+                checkbox.checked ? selected.add(day) : selected.delete(day);
+                job.days = [...selected];
+            };
+            dayLabel.appendChild(checkbox);
+            dayLabel.append(label);
+            days.appendChild(dayLabel);
+        });
+        item.appendChild(days);
+
+        [['max_relays', 'Max relays', '1'], ['cpus', 'CPUs', '0.1']].forEach(([field, placeholder, step]) => {
+            const input = document.createElement('input');
+            input.type = 'number';
+            input.className = 'form-input';
+            input.placeholder = placeholder;
+            input.step = step;
+            input.value = job[field] || '';
+            input.onchange = () => { job[field] = input.value; };
+            item.appendChild(input);
+        });
+
+        const next = document.createElement('span');
+        next.className = 'help-text';
+        next.textContent = job.in_window ? 'In window' : (job.next_run ? `Next: ${new Date(job.next_run).toLocaleString()}` : '');
+        item.appendChild(next);
+
+        const remove = document.createElement('button');
+        remove.className = 'btn btn-secondary btn-sm';
+        remove.textContent = 'Remove';
+        remove.onclick = () => {
+            importSchedule.splice(index, 1);
+            renderImportSchedule();
+        };
+        item.appendChild(remove);
+
+        list.appendChild(item);
+    });
+}
+
+function renderImportJobs(jobs) {
+    const list = document.getElementById('import-job-history');
+    list.innerHTML = '';
+
+    if (jobs.length === 0) {
+        list.innerHTML = '<p class="help-text">No imports have run yet.</p>';
+        return;
+    }
+
+    jobs.forEach(job => {
+        const item = document.createElement('div');
+        item.className = 'relay-item';
+        const label = document.createElement('span');
+        label.className = 'export-file-name';
+        const when = new Date(job.started_at * 1000).toLocaleString();
+        label.textContent = `${when} - ${job.trigger} - ${job.status} (${job.duration}s): ${job.message}`;
+        item.appendChild(label);
+        list.appendChild(item);
+    });
+}
+
+function addScheduleJob() {
+    importSchedule.push({ enabled: true, start: '02:00', end: '05:00', days: [] });
+    renderImportSchedule();
+}
+
+async function saveImportSchedule() {
+    try {
+        const response = await fetch('/api/import/schedule', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ jobs: importSchedule })
+        });
+        const data = await response.json();
+
+        if (data.success) {
+            showNotification('Import schedule saved', 'success');
+            loadImportSchedule();
+        } else {
+            showNotification('Failed to save schedule: ' + data.error, 'error');
+        }
+    } catch (error) {
+        showNotification('Error saving import schedule', 'error');
+        console.error(error);
+    }
+}
+
+// ==================== Relay Instances ====================
+
+let instancePollTimer = null;
+
+async function loadInstances() {
+    try {
+        const [statusResponse, rollingResponse] = await Promise.all([
+            fetch('/api/instances/status'),
+            fetch('/api/instances/restart')
+        ]);
+        const data = await statusResponse.json();
+        const rolling = await rollingResponse.json();
+
+        if (!data.success) {
+            document.getElementById('rolling-restart-text').textContent = data.error;
+            return;
+        }
+
+        const rollingRunning = rolling.status === 'running';
+        const rollingButton = document.getElementById('rolling-restart-btn');
+        rollingButton.disabled = rollingRunning;
+        rollingButton.innerHTML = rollingRunning ? '<span class="loading"></span> Restarting...' : 'Restart All';
+        document.getElementById('rolling-restart-text').textContent = rolling.status === 'idle' ? '' : rolling.message;
+
+        renderInstances(data.instances, rollingRunning);
+    } catch (error) {
+        console.error('Failed to load relay instances:', error);
+    }
+}
+
+function renderInstances(instances, rollingRunning) {
+    const list = document.getElementById('instance-list');
+    list.innerHTML = '';
+
+    instances.forEach(instance => {
+        const item = document.createElement('div');
+        item.className = 'relay-item';
+
+        const label = document.createElement('span');
+        label.className = 'export-file-name';
+        label.textContent = `${instance.name} (${instance.container})`;
+        item.appendChild(label);
+
+        const busy = instance.restart === 'running' || instance.import === 'running';
+        const state = document.createElement('span');
+        state.className = 'instance-state';
+        let stateText = instance.running ? 'Running' : `${instance.status} / ${instance.health}`;
+        if (instance.restart === 'running') {
+            stateText = 'Restarting...';
+        } else if (instance.import === 'running') {
+            stateText = 'Importing...';
+        } else if (!instance.configured) {
+            stateText += ' - not configured';
+        }
+        state.textContent = stateText;
+        item.appendChild(state);
+
+        const restart = document.createElement('button');
+        restart.className = 'btn btn-warning btn-sm';
+        restart.textContent = 'Restart';
+        restart.disabled = busy || rollingRunning;
+        restart.onclick = () => restartInstance(instance.name);
+        item.appendChild(restart);
+
+        if (instance.name !== 'default') {
+            const remove = document.createElement('button');
+            remove.className = 'btn btn-secondary btn-sm';
+            remove.textContent = 'Remove';
+            remove.disabled = busy || rollingRunning;
+            remove.onclick = () => removeInstance(instance.name);
+            item.appendChild(remove);
+        }
+
+        list.appendChild(item);
+    });
+}
+
+async function restartInstance(name) {
+    if (!confirm(`Restart the "${name}" relay?\n\nThis will briefly interrupt it.`)) {
+        return;
+    }
+
+    try {
+        const response = await fetch(`/api/instances/${encodeURIComponent(name)}/restart`, { method: 'POST' });
+        const data = await response.json();
+        showNotification(data.success ? `Restarting ${name}...` : 'Failed to restart: ' + data.error,
+            data.success ? 'info' : 'error');
+        loadInstances();
+    } catch (error) {
+        showNotification('Error restarting relay instance', 'error');
+        console.error(error);
+    }
+}
+
+async function rollingRestart() {
+    if (!confirm('Restart every relay instance?\n\nRelays are restarted a few at a time; no more are restarted after one fails.')) {
+        return;
+    }
+
+    try {
+        const response = await fetch('/api/instances/restart', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ concurrency: parseInt(document.getElementById('instance-concurrency').value, 10) })
+        });
+        const data = await response.json();
+        showNotification(data.success ? data.message : 'Failed to restart: ' + data.error,
+            data.success ? 'info' : 'error');
+        loadInstances();
+    } catch (error) {
+        showNotification('Error starting rolling restart', 'error');
+        console.error(error);
+    }
+}
+
+async function addInstance() {
+    const body = {
+        name: document.getElementById('instance-name').value.trim(),
+        container: document.getElementById('instance-container').value.trim(),
+        data_dir: document.getElementById('instance-data-dir').value.trim()
+    };
+    const port = document.getElementById('instance-port').value.trim();
+    if (port) {
+        body.port = parseInt(port, 10);
+    }
+
+    try {
+        const response = await fetch('/api/instances', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body)
+        });
+        const data = await response.json();
+
+        if (data.success) {
+            showNotification(`Added relay instance ${data.instance.name}`, 'success');
+            ['instance-name', 'instance-container', 'instance-data-dir', 'instance-port'].forEach(id => {
+                document.getElementById(id).value = '';
+            });
+            loadInstances();
+        } else {
+            showNotification('Failed to add instance: ' + data.error, 'error');
+        }
+    } catch (error) {
+        showNotification('Error adding relay instance', 'error');
+        console.error(error);
+    }
+}
+
+async function removeInstance(name) {
+    if (!confirm(`Stop managing the "${name}" relay?\n\nThe relay itself keeps running.`)) {
+        return;
+    }
+
+    try {
+        const response = await fetch(`/api/instances/${encodeURIComponent(name)}`, { method: 'DELETE' });
+        const data = await response.json();
+        showNotification(data.success ? `Removed relay instance ${name}` : 'Failed to remove: ' + data.error,
+            data.success ? 'success' : 'error');
+        loadInstances();
+    } catch (error) {
+        showNotification('Error removing relay instance', 'error');
+        console.error(error);
+    }
+}
+
+// Only poll instance status while the Instances tab is visible
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('.tab-button').forEach(button => {
+        button.addEventListener('click', () => {
+            if (instancePollTimer) {
+                clearInterval(instancePollTimer);
+                instancePollTimer = null;
+            }
+            if (button.dataset.tab === 'instances') {
+                loadInstances();
+                instancePollTimer = setInterval(loadInstances, 3000);
+            }
+        });
+    });
+});
@@ -5,6 +5,7 @@
 set -e
 
 CONFIG_ENV="/haven-config/.env"
+CONFIG_STAMP="/haven-config/.env.validated"
 TARGET_ENV="/haven/.env"
 
 # Copy and load the latest configuration if it exists in the shared volume.
@@ -29,6 +30,12 @@ sync_config() {
         # shellcheck disable=SC1090
         . "$TARGET_ENV"
         set +a
+
+        # An import run limited to fewer connections is pointed at a subset
+        # of the seed relays by the config UI.
+        if [ -n "${IMPORT_RUN_SEED_RELAYS_FILE:-}" ]; then
+            export IMPORT_SEED_RELAYS_FILE="$IMPORT_RUN_SEED_RELAYS_FILE"
+        fi
     else
         # Guarantee the relay still has an .env file to read.
         touch "$TARGET_ENV"
@@ -87,7 +94,20 @@ is_valid_npub() {
     [ "$_chk" -eq 1 ]
 }
 
+# The config UI verifies every npub before it saves the .env, then writes the
+# file's SHA-256 to $CONFIG_STAMP. If the .env is byte-for-byte what was
+# validated there, the (slow, per-character) checks below have already passed;
+# a hand-edited file no longer matches and gets the full validation. Keep in
+# sync with write_validated_stamp() in config-ui/app.py.
+is_stamped() {
+    [ -f "$CONFIG_STAMP" ] && [ -f "$CONFIG_ENV" ] || return 1
+    read -r _stamp < "$CONFIG_STAMP" || [ -n "$_stamp" ] || return 1
+    _digest=$(sha256sum "$CONFIG_ENV") || return 1
+    [ -n "$_stamp" ] && [ "$_stamp" = "${_digest%% *}" ]
+}
+
 is_configured() {
+    is_stamped && return 0
     for npub in "${OWNER_NPUB:-}" "${PRIVATE_RELAY_NPUB:-}" "${CHAT_RELAY_NPUB:-}" \
                 "${OUTBOX_RELAY_NPUB:-}" "${INBOX_RELAY_NPUB:-}"; do
         is_valid_npub "$npub" || return 1